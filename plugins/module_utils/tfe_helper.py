@@ -6,12 +6,203 @@ from __future__ import (absolute_import, division, print_function)
 
 __metaclass__ = type
 
+import hashlib
+import json
 import os
+import random
+import re
+import tempfile
+import threading
 import time
+from email.utils import mktime_tz, parsedate_tz
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import terrasnek.api
+import terrasnek.endpoint
 from terrasnek.api import TFC
+from terrasnek.exceptions import TFCHTTPBadRequest, TFCHTTPUnauthorized, TFCHTTPForbidden, TFCHTTPNotFound, \
+    TFCHTTPConflict, TFCHTTPPreconditionFailed, TFCHTTPUnprocessableEntity, TFCDeprecatedWontFix, InvalidTFCTokenException, \
+    TFCHTTPAPIRequestRateLimit, TFCHTTPInternalServerError, TFCHTTPUnclassified
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from ansible.module_utils.basic import env_fallback
-from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
+from ansible.module_utils.common.text.converters import to_native
+
+# Default number of threads used to call TFE endpoints concurrently
+DEFAULT_MAX_WORKERS = 8
+
+# Number of keep-alive connections kept open to the TFE host
+POOL_MAXSIZE = 16
+
+# Number of times a request is resent at once on a connection failure (e.g. a pooled connection closed by TFE),
+# before call_endpoint() sleeps and retries it
+CONNECTION_RETRIES = 2
+
+# Errors which will not go away by calling the endpoint again, i.e. retrying them only wastes time
+UNRECOVERABLE_EXCEPTIONS = (
+    TFCHTTPBadRequest,
+    TFCHTTPUnauthorized,
+    TFCHTTPForbidden,
+    TFCHTTPNotFound,
+    TFCHTTPConflict,
+    TFCHTTPPreconditionFailed,
+    TFCHTTPUnprocessableEntity,
+    TFCDeprecatedWontFix,
+    InvalidTFCTokenException,
+)
+
+# terrasnek exceptions matching HTTP status codes, for requests sent by TFEHelper itself
+HTTP_EXCEPTIONS = {
+    400: TFCHTTPBadRequest,
+    401: TFCHTTPUnauthorized,
+    403: TFCHTTPForbidden,
+    404: TFCHTTPNotFound,
+    409: TFCHTTPConflict,
+    412: TFCHTTPPreconditionFailed,
+    422: TFCHTTPUnprocessableEntity,
+    429: TFCHTTPAPIRequestRateLimit,
+    500: TFCHTTPInternalServerError,
+}
+
+# Workspace IDs, as opposed to workspace names
+WORKSPACE_ID_RE = re.compile(r'^ws-[A-Za-z0-9]{16}$')
+
+# The only terrasnek version whose internals _tfe_session() relies on, see requirements.txt
+TERRASNEK_TRANSPORT_VERSION = '0.1.3'
+
+# Options common to all modules, see TFEHelper.tfe_argument_spec()
+_TFE_ARG_SPEC = dict(
+    url=dict(type='str', no_log=False, required=False, fallback=(env_fallback, ['TFE_URL'])),
+    token=dict(type='str', no_log=True, required=False, default=None,
+               fallback=(env_fallback, ['TFE_TOKEN'])),
+    validate_certs=dict(type='bool', default=True, fallback=(env_fallback, ['SSL_VERIFY'])),
+    use_proxy=dict(type='bool', default=True),
+    sleep=dict(type='int', default=5),
+    retries=dict(type='int', default=3),
+    max_delay=dict(type='int', default=30),
+    jitter=dict(type='float', default=0.5),
+)
+
+# Decoder of TFE API responses, orjson is several times faster than json on large listings
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+def _json_dumps(obj):
+    # Encoder of TFE API request bodies (e.g. thousands of remote state consumers), bytes with orjson.
+    # orjson only handles native types, anything else is left to json.
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
+class _TerrasnekJSON:
+    # Stands in for the 'json' module in terrasnek, which only uses its loads() and dumps()
+    loads = staticmethod(_json_loads)
+    dumps = staticmethod(_json_dumps)
+
+
+_SESSION = None
+
+# 'Retry-After' header of the last response received by the current thread, see _record_retry_after()
+_LAST_RESPONSE = threading.local()
+
+
+def _record_retry_after(response, *args, **kwargs):
+    # terrasnek exceptions carry only the error messages, not the response, so the header is kept aside
+    _LAST_RESPONSE.retry_after = response.headers.get('Retry-After')
+
+
+def _parse_retry_after(value=None):
+    """
+    Returns the number of seconds requested by a 'Retry-After' header (delta-seconds or HTTP-date), or 0.
+    """
+    if not value:
+        return 0
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+
+    date = parsedate_tz(value)
+    if date is None:
+        return 0
+    return max(0, mktime_tz(date) - time.time())
+
+
+def _dict_subset(subset, superset):
+    # An empty dict is a subset of anything, as it always was
+    if not subset:
+        return True
+    if not isinstance(superset, dict):
+        return False
+    # When all values are hashable, compare both dicts' items at once
+    try:
+        return not (subset.items() - superset.items())
+    except TypeError:
+        return all(key in superset and _is_subset(val, superset[key]) for key, val in subset.items())
+
+
+def _seq_subset(subset, superset):
+    return all(any(_is_subset(subitem, superitem) for superitem in superset) for subitem in subset)
+
+
+# is_subset() handlers by type of the subset, any other value is compared as a plain value
+_SUBSET_DISPATCH = {
+    dict: _dict_subset,
+    list: _seq_subset,
+    set: _seq_subset,
+}
+
+
+def _is_subset(subset, superset):
+    handler = _SUBSET_DISPATCH.get(type(subset))
+    if handler is None:
+        # Subclasses (e.g. OrderedDict) are handled like their base type
+        handler = next((h for t, h in _SUBSET_DISPATCH.items() if isinstance(subset, t)), None)
+    return handler(subset, superset) if handler else subset == superset
+
+
+def _tfe_session():
+    """
+    Returns the HTTP session shared by all TFE API calls.
+
+    terrasnek issues requests through the module level functions of 'requests', which open a new
+    connection (and TLS handshake) for every single call. Routing them through one pooled session
+    lets consecutive and parallel calls reuse keep-alive connections instead.
+
+    terrasnek offers no way to pass a session, so its 'requests' and 'json' module globals are replaced.
+    This relies on its internals, and is therefore only done for TERRASNEK_TRANSPORT_VERSION. Any other
+    version keeps its own transport, i.e. it still works, without connection reuse and orjson decoding.
+    The replacement affects the whole process, which only ever runs a single module.
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        # Only connection and read failures are retried here (reads for idempotent methods only), responses are
+        # left to call_endpoint(), which raises the unrecoverable ones and backs off on the others
+        retry = Retry(total=CONNECTION_RETRIES, status=0, backoff_factor=0.1, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+        _SESSION.mount('https://', adapter)
+        _SESSION.mount('http://', adapter)
+        _SESSION.hooks['response'].append(_record_retry_after)
+        if getattr(terrasnek.api, 'TERRASNEK_VERSION', None) == TERRASNEK_TRANSPORT_VERSION:
+            # requests.Session provides the same get/post/patch/put/delete methods as the module
+            terrasnek.api.requests = _SESSION
+            terrasnek.endpoint.requests = _SESSION
+            if HAS_ORJSON:
+                terrasnek.api.json = terrasnek.endpoint.json = _TerrasnekJSON
+
+    return _SESSION
 
 #
 # class: TFEHelper
@@ -26,67 +217,718 @@ class TFEHelper:
         if self.module.params['url'] is None:
             self.module.params['url'] = self.TFE_URL
 
+        self.session = _tfe_session()
+        self.session.trust_env = self.module.params['use_proxy']
+
         self.api = TFC(self.module.params['token'], url=self.module.params['url'], verify=self.module.params['validate_certs'])
 
+        # The list of organizations is retrieved at most once per module run, see list_orgs()
+        self._orgs_list_cache = None
+        self._orgs_index_cache = None
+        self._orgs_show_cache = {}
+        self._memberships_cache = {}
+
+        # On-disk caches of conditional GET responses, loaded at most once per module run, see get_conditional().
+        # Only the responses used during the run are written back, see save_http_cache().
+        self._http_caches = {}
+        self._http_caches_used = {}
+        self._http_caches_lock = threading.Lock()
+
 
     @staticmethod
     def tfe_argument_spec():
-        return dict(
-            url=dict(type='str', no_log=False, required=False, fallback=(env_fallback, ['TFE_URL'])),
-            token=dict(type='str', no_log=True, required=False, default=None,
-                       fallback=(env_fallback, ['TFE_TOKEN'])),
-            validate_certs=dict(type='bool', default=True, fallback=(env_fallback, ['SSL_VERIFY'])),
-            use_proxy=dict(type='bool', default=True),
-            sleep=dict(type='int', default=5),
-            retries=dict(type='int', default=3),
-        )
+        # Each option dict is copied too, so that a module can never alter the shared definitions
+        return dict((name, dict(spec)) for name, spec in _TFE_ARG_SPEC.items())
+
 
+    def set_org(self, org_name=None):
+        """
+        Sets the organization to use for org specific endpoints.
 
-    def call_endpoint(self, endpoint=None, **kwargs):
+        terrasnek's set_org() sends no request, but it re-creates all org specific endpoints. This is skipped
+        when the client already works on the given organization. A new client has no organization
+        and no org specific endpoints yet, so they are always created for None.
+        """
+        if (org_name is None) or (self.api.get_org() != org_name):
+            self.api.set_org(org_name)
+
+
+    def call_endpoint(self, endpoint=None, unrecoverable=UNRECOVERABLE_EXCEPTIONS, retry=True, **kwargs):
         """
         Call TFE endpoint with parameters provided in arguments
 
         It will try to call the endpoint 'retries' times until it gives up.
-        """  
-        exception = None
+        Only transient errors (rate limiting, server and connection errors) are retried,
+        with an exponential backoff and a random jitter between attempts.
+        Exceptions listed in 'unrecoverable' (authentication, authorization, not found, etc. by default)
+        are raised at once, without sleeping.
+        When TFE sends a 'Retry-After' header (e.g. on '429 Too Many Requests'), it waits at least that long.
+        With 'retry' unset, the endpoint is called once. This is meant for TFEHelper methods (e.g. list_all())
+        which retry their own requests already, so that retries are not nested.
+        """
         retries = 1
-        while retries <= self.module.params['retries']:
+        while True:
+            _LAST_RESPONSE.retry_after = None
             try:
-                ret = endpoint(**kwargs)
-                return ret   
-            except Exception as e:                
-                exception = e
-                time.sleep(self.module.params['sleep'])
+                return endpoint(**kwargs)
+            except unrecoverable:
+                raise
+            except Exception:
+                if (not retry) or (retries >= self.module.params['retries']):
+                    raise
+                time.sleep(max(self.get_retry_delay(retries), _parse_retry_after(getattr(_LAST_RESPONSE, 'retry_after', None))))
                 retries += 1
 
-        # Chain exceptions
-        raise exception
 
-        return None
+    def safe_call(self, endpoint=None, fail_msg=None, **kwargs):
+        """
+        Call TFE endpoint like call_endpoint() does, failing the module when the call does not succeed.
 
+        'fail_msg' describes the failure, the error is appended to it.
+        """
+        try:
+            return self.call_endpoint(endpoint, **kwargs)
+        except Exception as e:
+            self.module.fail_json(msg='%s Error: %s.' % (fail_msg, to_native(e)))
 
-    def listify_comma_sep_strings_in_list(self, some_list):
+
+    def call_endpoints(self, calls=None, max_workers=None, retry=True):
+        """
+        Call several independent TFE endpoints concurrently.
+
+        'calls' is a dict mapping an arbitrary key to an (endpoint, kwargs) tuple. It may also be
+        an iterable (e.g. a generator) of (key, (endpoint, kwargs)) pairs, in which case calls are
+        submitted while the iterable is consumed. kwargs may include 'unrecoverable', and 'retry' applies to all calls,
+        see call_endpoint(). Returns a dict mapping the same keys to the endpoint responses. A call which failed
+        maps to the exception it raised, so that the caller can report it in its own terms.
+        """
+        if max_workers is None:
+            max_workers = self.module.params.get('max_workers') or DEFAULT_MAX_WORKERS
+
+        if isinstance(calls, dict):
+            calls = calls.items()
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = dict(
+                (executor.submit(self.call_endpoint, endpoint, retry=retry, **kwargs), key) for key, (endpoint, kwargs) in calls
+            )
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = e
+
+        return results
+
+
+    def list_all(self, endpoint=None, url=None, page_size=100, fields=None, cache=True, **kwargs):
         """
-        method to accept a list of strings as the parameter, find any strings
-        in that list that are comma separated, remove them from the list and add
-        their comma separated elements to the original list
+        Returns all pages of the given list URL of a terrasnek endpoint, as an object with 'data' and 'included' arrays.
+
+        This is a replacement for the endpoint's _list_all(), which fetches the first page twice and the next ones
+        one after another. Here, the first page reveals the number of pages, all the others are requested concurrently.
+        kwargs are passed to the endpoint's _list() (e.g. include, search, filters, query).
+        'fields' may map a resource type to the only attributes to return (a JSON:API sparse fieldset),
+        e.g. {'workspaces': ['name']}, which terrasnek's _list() does not support.
+        With 'cache_dir' set, the pages of each list are cached in a file of their own, unless 'cache' is unset
+        (e.g. for lookups of a single user, which would leave a file behind for each of them).
         """
-        new_list = []
-        remove_from_original_list = []
-        for element in some_list:
-            if ',' in element:
-                remove_from_original_list.append(element)
-                new_list.extend([e.strip() for e in element.split(',')])
+        cache_file = None
+        if cache:
+            list_key = repr((url, page_size, sorted(kwargs.items()), sorted((fields or {}).items())))
+            cache_file = self.get_cache_file('list_%s' % hashlib.sha256(list_key.encode('utf-8')).hexdigest()[:16])
+
+        # terrasnek's _list() puts the query, filter and search values into the URL as they are,
+        # so that e.g. a '+' in an email would be read as a space. get_conditional() encodes them.
+        encode = any(kwargs.get(k) is not None for k in ('query', 'filters', 'search'))
+
+        def page_call(page_number):
+            # With an on-disk cache, unchanged pages are revalidated by their ETag instead of being downloaded again
+            if (cache_file is not None) or fields or encode:
+                params = self.list_params(page=page_number, page_size=page_size, fields=fields, **kwargs)
+                return (self.get_conditional, dict(url=url, params=params, cache_file=cache_file))
+            return (endpoint._list, dict(kwargs, url=url, page=page_number, page_size=page_size))
+
+        first_endpoint, first_kwargs = page_call(1)
+        first_page = self.call_endpoint(first_endpoint, **first_kwargs)
+        total_pages = first_page.get('meta', {}).get('pagination', {}).get('total-pages', 1)
+
+        pages = self.call_endpoints(dict(
+            (page_number, page_call(page_number)) for page_number in range(2, total_pages + 1)
+        ))
+
+        data = list(first_page['data'])
+        included = list(first_page.get('included', []))
+        for page_number in range(2, total_pages + 1):
+            page = pages[page_number]
+            if isinstance(page, Exception):
+                raise page
+            data.extend(page['data'])
+            included.extend(page.get('included', []))
+
+        self.save_http_cache(cache_file)
+        return dict(data=data, included=included)
+
+
+    def iter_pages(self, endpoint=None, url=None, page_size=100, **kwargs):
+        """
+        Yields the pages of the given list URL of a terrasnek endpoint one after another, see list_all().
+
+        Only one page is held in memory at a time, and the caller may stop as soon as it found what it needs,
+        in which case the remaining pages are never requested.
+        """
+        page_number = 1
+        while True:
+            page = self.call_endpoint(endpoint._list, url=url, page=page_number, page_size=page_size, **kwargs)
+            yield page
+
+            if page_number >= page.get('meta', {}).get('pagination', {}).get('total-pages', 1):
+                break
+            page_number += 1
+
+
+    @staticmethod
+    def list_params(query=None, filters=None, page=None, page_size=None, search=None, include=None, fields=None):
+        """
+        Returns the query parameters of a list request, the same way terrasnek's _list() builds them.
+        """
+        params = []
+        if query is not None:
+            params.append(('q', query))
+        for f in (filters or []):
+            params.append(('filter' + ''.join('[%s]' % k for k in f['keys']), f['value']))
+        if page is not None:
+            params.append(('page[number]', page))
+        if page_size is not None:
+            params.append(('page[size]', page_size))
+        if include is not None:
+            params.append(('include', ','.join(include)))
+        if search is not None:
+            params.append(('search[name]', search))
+        for resource_type, attributes in sorted((fields or {}).items()):
+            params.append(('fields[%s]' % resource_type, ','.join(attributes)))
+
+        return params
+
+
+    def get_retry_delay(self, retries=1):
+        """
+        Returns the number of seconds to sleep before the given retry attempt.
+
+        The delay doubles with each attempt starting at 'sleep', is stretched by a random
+        'jitter' factor and never exceeds 'max_delay'.
+        """
+        delay = self.module.params['sleep'] * (2 ** (retries - 1)) * (1 + random.random() * self.module.params['jitter'])
+        return min(self.module.params['max_delay'], delay)
+
+
+    def list_orgs(self, force=False):
+        """
+        Returns the list of all organizations.
+
+        The list is retrieved from TFE on the first call only and served from cache afterwards,
+        unless 'force' is set. Use invalidate_orgs_cache() after modifying organizations.
+        """
+        if force or self._orgs_list_cache is None:
+            self._orgs_list_cache = dict(data=list(self.iter_orgs()))
+            self._orgs_index_cache = None
+
+        return self._orgs_list_cache
+
+
+    def iter_orgs(self, page_size=100):
+        """
+        Yields all organizations, retrieving them from TFE page by page.
+        """
+        for page in self._iter_org_pages(page_size=page_size):
+            for org in page['data']:
+                yield org
+
+
+    def _iter_org_pages(self, page_size=100):
+        url = self.api.orgs._org_api_v2_base_url
+        cache_file = self.get_cache_file('orgs')
+
+        page_number = 1
+        try:
+            while True:
+                if cache_file is not None:
+                    page = self.call_endpoint(self.get_conditional, url='%s?page[number]=%d&page[size]=%d' % (url, page_number, page_size), cache_file=cache_file)
+                else:
+                    page = self.call_endpoint(self.api.orgs._list, url=url, page=page_number, page_size=page_size)
+                yield page
+
+                if page_number >= page.get('meta', {}).get('pagination', {}).get('total-pages', 1):
+                    break
+                page_number += 1
+        finally:
+            # Also when the caller stops early, the pages retrieved so far are kept
+            self.save_http_cache(cache_file)
+
+
+    def get_conditional(self, url=None, cache_file=None, params=None):
+        """
+        HTTP GET the given TFE API URL, sending the ETag of its response cached in 'cache_file' (if any).
+        'params' may provide the query parameters as a list of (name, value) pairs.
+
+        When TFE answers '304 Not Modified', the cached response is returned without downloading it again.
+        Otherwise, the new response and its ETag are kept in memory, to be stored by save_http_cache() once all pages are retrieved.
+        It may be called from several threads at once (e.g. by list_all()), the cache is updated under a lock.
+        Without 'cache_file', it is a plain HTTP GET.
+        """
+        if params:
+            url = requests.Request('GET', url, params=params).prepare().url
+
+        cache = None
+        cached = None
+        if cache_file is not None:
+            with self._http_caches_lock:
+                if cache_file not in self._http_caches:
+                    self._http_caches[cache_file] = self.read_cache(cache_file)
+                cache = self._http_caches[cache_file]
+                cached = cache.get(url)
+                used = self._http_caches_used.setdefault(cache_file, {})
+
+        headers = dict(self.api._headers)
+        if cached is not None:
+            headers['If-None-Match'] = cached['etag']
 
-        for element in remove_from_original_list:
-            some_list.remove(element)
+        resp = self.session.get(url, headers=headers, verify=self.module.params['validate_certs'])
 
-        some_list.extend(new_list)
+        if resp.status_code == 304 and cached is not None:
+            with self._http_caches_lock:
+                used[url] = cached
+            return cached['body']
 
-        if some_list == [""]:
-            return []
+        if resp.status_code != 200:
+            raise self.http_error(resp)
 
-        return some_list
+        body = _json_loads(resp.content)
+        if (cache is not None) and resp.headers.get('ETag'):
+            with self._http_caches_lock:
+                used[url] = dict(etag=resp.headers['ETag'], body=body)
+
+        return body
+
+
+    def save_http_cache(self, cache_file=None):
+        """
+        Stores the responses used with the given cache file during this module run, see get_conditional().
+
+        Responses not used anymore (e.g. pages past the last one) are dropped, which keeps the file to the size of a single list.
+        Nothing is written when the responses are unchanged. Storing them is best-effort: a failure (e.g. read-only
+        'cache_dir', full disk) is reported as a warning, since the responses were retrieved anyway.
+        """
+        if cache_file is None:
+            return
+
+        with self._http_caches_lock:
+            used = self._http_caches_used.pop(cache_file, None)
+            if (used is None) or (used == self._http_caches.get(cache_file)):
+                return
+            self._http_caches[cache_file] = used
+
+        try:
+            self.write_cache(cache_file, used)
+        except (IOError, OSError, TypeError, ValueError) as e:
+            self.module.warn('Unable to store cached TFE API responses in "%s": %s' % (cache_file, to_native(e)))
+
+
+    @staticmethod
+    def http_error(resp=None):
+        """
+        Returns the terrasnek exception matching the status code of the given response.
+        """
+        try:
+            err = _json_loads(resp.content)
+        except ValueError:
+            err = resp.text
+        return HTTP_EXCEPTIONS.get(resp.status_code, TFCHTTPUnclassified)(err)
+
+
+    def get_cache_file(self, name=None):
+        """
+        Returns the path of the on-disk cache file with the given name, or None when 'cache_dir' is not set.
+
+        The file name depends on the TFE URL and token, so that different instances and users never share cached responses.
+        """
+        if not self.module.params.get('cache_dir'):
+            return None
+
+        key = hashlib.sha256(('%s|%s' % (self.module.params['url'], self.module.params['token'])).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(os.path.expanduser(self.module.params['cache_dir']), 'tfe_%s_%s.json' % (name, key))
+
+
+    @staticmethod
+    def read_cache(cache_file=None):
+        """
+        Returns the content of the given cache file, or an empty dict when it does not exist or cannot be read.
+        """
+        try:
+            with open(cache_file) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+
+    @staticmethod
+    def write_cache(cache_file=None, content=None):
+        """
+        Atomically replaces the content of the given cache file. The file is readable by its owner only.
+        """
+        cache_dir = os.path.dirname(cache_file)
+        # Several module runs may create the directory at the same time
+        os.makedirs(cache_dir, 0o700, exist_ok=True)
+
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, prefix='.tfe_')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(content, f)
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            os.unlink(tmp_file)
+            raise
+
+
+    def list_orgs_index(self, force=False):
+        """
+        Returns the list of all organizations indexed by their name/id ('by_id') and external-id ('by_ext').
+        """
+        all_organizations = self.list_orgs(force=force)
+        if self._orgs_index_cache is None:
+            self._orgs_index_cache = self._build_org_index(all_organizations['data'])
+
+        return self._orgs_index_cache
+
+
+    @staticmethod
+    def _build_org_index(data):
+        # Both indexes are filled in a single pass over the organizations
+        index = dict(by_id={}, by_ext={})
+        for o in data:
+            index['by_id'][o['id']] = o
+            index['by_ext'][o['attributes']['external-id']] = o
+
+        return index
+
+
+    def list_memberships(self, query=None, filters=None, include=None, force=False, cache=True):
+        """
+        Returns the memberships of the current organization, like org_memberships.list_all_for_org() does.
+
+        Each combination of organization, query, filters and include is retrieved from TFE once and served from cache afterwards,
+        unless 'force' is set. Use invalidate_memberships_cache() after inviting or removing members.
+        'cache' is passed to list_all(), i.e. unset it to keep the list out of 'cache_dir'.
+        """
+        key = (
+            self.api.get_org(),
+            query,
+            None if filters is None else tuple((tuple(f['keys']), f['value']) for f in filters),
+            None if include is None else tuple(include),
+        )
+        if force or key not in self._memberships_cache:
+            self._memberships_cache[key] = self.list_all(
+                self.api.org_memberships, url=self.api.org_memberships._org_base_url, query=query, filters=filters, include=include,
+                cache=cache
+            )
+
+        return self._memberships_cache[key]
+
+
+    def show_membership(self, org_membership_id=None, include=None):
+        """
+        Returns details on the given membership of the current organization, or None when it does not exist there.
+
+        A membership ID is requested regardless of its organization, so a membership of any other organization
+        is treated as missing too.
+        """
+        try:
+            membership = self.call_endpoint(self.api.org_memberships.show, org_membership_id=org_membership_id, include=include)
+        except TFCHTTPNotFound:
+            return None
+
+        organization = ((membership['data'].get('relationships') or {}).get('organization') or {}).get('data') or {}
+        if organization.get('id') != self.api.get_org():
+            return None
+
+        return membership
+
+
+    def remove_membership(self, org_membership_id=None):
+        """
+        Removes the given organization membership. Returns False when it does not exist, True otherwise.
+
+        Unlike org_memberships.remove(), which reports any failure as TFCHTTPUnclassified, it tells '404 Not Found' apart.
+        """
+        url = '%s/%s' % (self.api.org_memberships._endpoint_base_url, org_membership_id)
+        resp = self.session.delete(url, headers=self.api._headers, verify=self.module.params['validate_certs'])
+
+        if resp.status_code == 404:
+            return False
+        if resp.status_code not in (200, 204):
+            raise self.http_error(resp)
+
+        self.invalidate_memberships_cache()
+        return True
+
+
+    def invalidate_memberships_cache(self):
+        """
+        Drops all cached lists of memberships, so that the next list_memberships() call retrieves them again.
+        """
+        self._memberships_cache = {}
+
+
+    @staticmethod
+    def build_membership_index(memberships=None):
+        """
+        Indexes the given organization memberships (a list_all_for_org() response including "user") by membership ID ('by_id'),
+        user email ('by_email') and user ID ('by_user'). Included users are indexed by their username ('by_username').
+        """
+        by_id, by_email, by_user, by_username = {}, {}, {}, {}
+
+        # The indexes are filled for every single membership, so their methods are bound once, outside the loop.
+        # The first matching record wins, as it did when scanning the lists.
+        add_id, add_email, add_user, add_username = by_id.setdefault, by_email.setdefault, by_user.setdefault, by_username.setdefault
+        for m in memberships['data']:
+            add_id(m['id'], m)
+            add_email(m['attributes']['email'], m)
+            add_user(m['relationships']['user']['data']['id'], m)
+        for i in memberships.get('included', []):
+            add_username(i['attributes']['username'], i)
+
+        return dict(by_id=by_id, by_email=by_email, by_user=by_user, by_username=by_username)
+
+
+    def list_cached(self, name=None, fetch=None):
+        """
+        Returns the list retrieved by 'fetch' (a callable), caching it on disk under the given name.
+
+        When 'cache_dir' is set, the list of the current organization is served from there for 'cache_ttl' seconds,
+        so that consecutive module runs against the same organization do not retrieve it again.
+        Use drop_cached() after modifying the listed resources. Caching the list is best-effort: failing to store it
+        (e.g. read-only 'cache_dir', full disk) is reported as a warning and the list is returned anyway.
+        """
+        cache_file = None
+        if self.module.params.get('cache_ttl'):
+            cache_file = self.get_cache_file('%s_%s' % (name, self.api.get_org()))
+
+        if cache_file is not None:
+            try:
+                fresh = time.time() - os.path.getmtime(cache_file) < self.module.params['cache_ttl']
+            except OSError:
+                fresh = False
+            if fresh:
+                content = self.read_cache(cache_file)
+                if 'data' in content:
+                    return content
+
+        content = fetch()
+        if cache_file is not None:
+            try:
+                self.write_cache(cache_file, content)
+            except (IOError, OSError) as e:
+                self.module.warn('Unable to cache the list of %s in "%s": %s' % (name, cache_file, to_native(e)))
+
+        return content
+
+
+    def drop_cached(self, name=None):
+        """
+        Removes the list of the current organization cached on disk under the given name, see list_cached().
+        """
+        cache_file = self.get_cache_file('%s_%s' % (name, self.api.get_org()))
+        if cache_file is not None:
+            try:
+                os.remove(cache_file)
+            except OSError:
+                pass
+
+
+    def list_workspaces(self):
+        """
+        Returns all workspaces of the current organization, without additional details.
+
+        Only their IDs and names are requested (and kept), which keeps both the responses and the list small
+        in organizations with thousands of workspaces.
+        The list is cached on disk when 'cache_dir' is set, see list_cached().
+        """
+        def fetch():
+            workspaces = self.list_all(
+                self.api.workspaces, url=self.api.workspaces._org_api_v2_base_url, include=None, fields={'workspaces': ['name']}
+            )
+            return dict(data=[
+                dict(id=w['id'], type=w['type'], attributes=dict(name=w['attributes']['name'])) for w in workspaces['data']
+            ])
+
+        return self.list_cached('workspaces', fetch)
+
+
+    def invalidate_workspaces_cache(self):
+        """
+        Drops the workspaces of the current organization cached in 'cache_dir' (see list_workspaces()), so that
+        they are retrieved again after a workspace was created, renamed or destroyed.
+        """
+        self.drop_cached('workspaces')
+
+
+    def show_workspace(self, workspace_name=None, workspace_id=None):
+        """
+        Returns details on the given workspace (by name in the current organization, or by ID), or None when it does not exist.
+
+        A single request, where looking a workspace up in list_workspaces() lists the whole organization.
+        """
+        try:
+            return self.call_endpoint(self.api.workspaces.show, workspace_name=workspace_name, workspace_id=workspace_id)
+        except TFCHTTPNotFound:
+            return None
+
+
+    def resolve_workspace_id(self, workspace=None):
+        """
+        Returns the ID of the given workspace (name or ID) of the current organization, or None when it does not exist.
+
+        An ID is returned as is, without any request. A name is looked up with show_workspace(), and when no workspace
+        has that name, it is looked up as an ID the same way if it starts like one, so that the organization is never listed.
+        """
+        if self.is_workspace_id(workspace):
+            return workspace
+
+        w = self.show_workspace(workspace_name=workspace)
+        if (w is None) and workspace.startswith('ws-'):
+            w = self.show_workspace(workspace_id=workspace)
+        return None if w is None else w['data']['id']
+
+
+    def get_workspace_id_or_fail(self, workspace=None):
+        """
+        Returns the ID of the given workspace (name or ID) of the current organization, failing the module when it does not exist.
+
+        When the list of workspaces is cached on disk (see list_workspaces()), the workspace is looked up there.
+        Otherwise, only the given workspace is requested, see resolve_workspace_id().
+        """
+        organization = self.api.get_org()
+        if self.module.params.get('cache_dir') and self.module.params.get('cache_ttl'):
+            workspaces = self.safe_call(
+                self.list_workspaces, fail_msg='Unable to list workspaces in "%s" organization.' % organization, retry=False
+            )
+            workspace_id = self.find_workspace_id(self.build_workspace_index(workspaces), workspace=workspace)
+        else:
+            workspace_id = self.safe_call(
+                self.resolve_workspace_id, fail_msg='Unable to retrieve details on "%s" workspace in "%s" organization.' % (workspace, organization),
+                workspace=workspace, retry=False
+            )
+
+        if workspace_id is None:
+            self.module.fail_json(msg='The supplied "%s" workspace does not exist in "%s" organization.' % (workspace, organization) )
+
+        return workspace_id
+
+
+    @staticmethod
+    def find_workspace_id(workspaces_index=None, workspace=None):
+        """
+        Returns the ID of the given workspace (name or ID) in a build_workspace_index() index, or None when it is not there.
+
+        A workspace is referred to by its name, next by its ID.
+        """
+        if workspace in workspaces_index['by_name']:
+            return workspaces_index['by_name'][workspace]['id']
+
+        return workspace if workspace in workspaces_index['by_id'] else None
+
+
+    @staticmethod
+    def is_workspace_id(value=None):
+        """
+        Checks if the given value is a workspace ID (e.g. ws-SihZTyXKfNXUWuUa) rather than a workspace name.
+        """
+        return WORKSPACE_ID_RE.match(value) is not None
+
+
+    @staticmethod
+    def build_workspace_index(workspaces=None):
+        """
+        Indexes the given workspaces (a workspaces list_all() response) by name ('by_name') and ID ('by_id'), in a single pass.
+        """
+        index = dict(by_name={}, by_id={})
+        for w in workspaces['data']:
+            # The first workspace with a given name wins, as it did when scanning the list
+            index['by_name'].setdefault(w['attributes']['name'], w)
+            index['by_id'][w['id']] = w
+
+        return index
+
+
+    def list_ssh_keys(self):
+        """
+        Returns all SSH keys of the current organization.
+        The list is cached on disk when 'cache_dir' is set, see list_cached().
+        """
+        return self.list_cached('ssh_keys', lambda: self.call_endpoint(self.api.ssh_keys.list))
+
+
+    def invalidate_ssh_keys_cache(self):
+        """
+        Drops the SSH keys of the current organization cached in 'cache_dir' (see list_ssh_keys()), so that they are
+        retrieved again after an SSH key was created, updated or destroyed.
+        """
+        self.drop_cached('ssh_keys')
+
+
+    def invalidate_orgs_cache(self):
+        """
+        Drops the cached list of organizations, so that the next list_orgs() call retrieves it again.
+        """
+        self._orgs_list_cache = None
+        self._orgs_index_cache = None
+        self._orgs_show_cache = {}
+
+
+    def show_org(self, org_name=None):
+        """
+        Returns details on the given organization.
+
+        The details are retrieved from TFE on the first call only and served from cache afterwards.
+        """
+        if org_name not in self._orgs_show_cache:
+            self._orgs_show_cache[org_name] = self.call_endpoint(self.api.orgs.show, org_name=org_name)
+
+        return self._orgs_show_cache[org_name]
+
+
+    def exists_org(self, name_or_id=None):
+        """
+            Checks if the given organization exists, by requesting that single organization.
+            Returns the organization name, when it exists. Otherwise, it returns None.
+
+            Only when no organization has the given name and the value looks like an external-id,
+            the (cached) list of all organizations is searched by external-id.
+        """
+        try:
+            return self.show_org(org_name=name_or_id)['data']['id']
+        except TFCHTTPNotFound:
+            if not name_or_id.startswith('org-'):
+                return None
+
+        org = self.list_orgs_index()['by_ext'].get(name_or_id)
+        if org is None:
+            return None
+
+        # The listed organization carries the same details, no need to request them again in show_org()
+        self._orgs_show_cache.setdefault(org['id'], dict(data=org))
+        return org['id']
+
+
+    def listify_comma_sep_strings_in_list(self, some_list):
+        """
+        method to accept a list of strings as the parameter, split any strings
+        in that list that are comma separated and return a new list with all
+        their elements stripped, in a single pass. Empty elements are dropped.
+        """
+        out = [e.strip() for item in some_list for e in (item.split(',') if ',' in item else [item])]
+        return [x for x in out if x]
 
 
     def get_org_name_when_exists(self, organization=None, return_org_name_on_unauthorized=True):
@@ -95,39 +937,20 @@ class TFEHelper:
             Returns the organization name, when it exists. Otherwise, it returns None.
 
             'organization' parameter may represent the organization id/noame or external-id
+            The organization is looked up with exists_org(), i.e. usually a single request.
         """
-        # First, get the list of all organizations
-        try:        
-            all_organizations = self.call_endpoint(self.api.orgs.list)
+        try:
+            return self.exists_org(name_or_id=organization)
         except Exception as e:
             if return_org_name_on_unauthorized:
                 return organization
             else:
                 self.module.fail_json(msg='Unable to list organizations. Error: %s.' % (to_native(e)) )
 
-        org_name = None
-
-        # Try to find organization by its external-id
-        if any(o['attributes']['external-id'] == organization for o in all_organizations['data']):
-            org_name = [o for o in all_organizations['data'] if o['attributes']['external-id'] == organization][0]['id']       
-
-        if (org_name is None) and any(o['id'] == organization for o in all_organizations['data']):
-            # Next, try to find organization by its name
-            org_name = [o for o in all_organizations['data'] if o['id'] == organization][0]['id'] 
-
-        return org_name
-
 
     def is_subset(self, subset=None, superset=None):
         """
         Check if 'subset' is subset of 'superset'
 
         """
-        if isinstance(subset, dict):
-            return all(key in superset and self.is_subset(val, superset[key]) for key, val in subset.items())
-
-        if isinstance(subset, list) or isinstance(subset, set):
-            return all(any(self.is_subset(subitem, superitem) for superitem in superset) for subitem in subset)
-
-        # assume that subset is a plain value if none of the above match
-        return subset == superset
+        return _is_subset(subset, superset)
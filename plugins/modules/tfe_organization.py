@@ -98,14 +98,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -192,7 +205,7 @@ json:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
+from ansible.module_utils.common.text.converters import to_native
 
 from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
 
@@ -235,11 +248,15 @@ def main():
     # Destroy the Organization if it exists and state == 'absent'
     if state == 'absent':
 
-        existing_org_name = tfe.get_org_name_when_exists(organization=organization)
+        try:
+            existing_org_name = tfe.exists_org(name_or_id=organization)
+        except Exception as e:
+            module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (organization, to_native(e)) )
 
         if existing_org_name is not None:
             if not module.check_mode:            
                 result['json'] = tfe.call_endpoint(tfe.api.orgs.destroy, org_name=existing_org_name)
+                tfe.invalidate_orgs_cache()
             result['changed'] = True
  
     # Create or update the Organization if state == 'present'
@@ -251,20 +268,23 @@ def main():
         if 'name' not in attributes:
             module.fail_json(msg='`name` is required when the `state` is `present`')
 
-        o_payload = {
-          "data": {
-            "type": "organizations",
-            "attributes": attributes
-          }
-        }
-
-        existing_org_name = tfe.get_org_name_when_exists(organization=attributes['name'])
+        try:
+            existing_org_name = tfe.exists_org(name_or_id=attributes['name'])
+        except Exception as e:
+            module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (attributes['name'], to_native(e)) )
 
         # Create the Organization if it does not exist
         if existing_org_name is None:
             if not module.check_mode:  
+                o_payload = {
+                  "data": {
+                    "type": "organizations",
+                    "attributes": attributes
+                  }
+                }
                 try:        
                     result['json'] = tfe.call_endpoint(tfe.api.orgs.create, payload=o_payload)
+                    tfe.invalidate_orgs_cache()
                 except Exception as e:
                     module.fail_json(msg='Unable to create organization. Error: %s.' % (to_native(e)) )
 
@@ -274,17 +294,24 @@ def main():
         else:
 
             try:        
-                all_organizations = tfe.call_endpoint(tfe.api.orgs.list)
+                current_attributes = tfe.show_org(org_name=existing_org_name)['data']['attributes']
             except Exception as e:
-                module.fail_json(msg='Unable to list organizations. Error: %s.' % (to_native(e)) )
+                module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (existing_org_name, to_native(e)) )
 
-            # Check if 'attributes' is a subset of current attributes, i.e. if there is any change
-            current_attributes = [o for o in all_organizations['data'] if o['id'] == existing_org_name][0]['attributes']            
+            # Check if 'attributes' is a subset of current attributes, i.e. if there is any change.
+            # The current attributes come from the lookup above, so check mode needs no additional API call.
             if not tfe.is_subset(subset=attributes, superset=current_attributes):
 
                 if not module.check_mode:  
+                    o_payload = {
+                      "data": {
+                        "type": "organizations",
+                        "attributes": attributes
+                      }
+                    }
                     try:        
                         result['json'] = tfe.call_endpoint(tfe.api.orgs.update, org_name=existing_org_name, payload=o_payload)
+                        tfe.invalidate_orgs_cache()
                     except Exception as e:
                         module.fail_json(msg='Unable to update "%s" organization. Error: %s.' % (existing_org_name, to_native(e)) )
 
@@ -39,6 +39,26 @@ options:
     type: list
     required: false
     default: [ '*' ]
+  max_workers:
+    description:
+    - Maximum number of organization details requests sent to Terraform Enterprise in parallel.
+    type: int
+    required: false
+    default: 8
+  stream:
+    description:
+    - When listing all organizations, request their details while the next pages of organizations are still being retrieved.
+    - The result is the same either way. When C(false), the complete list of organizations is retrieved first.
+    type: bool
+    required: false
+    default: true
+  cache_dir:
+    description:
+    - Directory where the list of organizations is cached, e.g. C(~/.ansible/tmp).
+    - When set, the list is requested with the ETag of the cached copy, and it is downloaded again only when it has changed.
+    - By default, nothing is cached on disk.
+    type: path
+    required: false
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated.
@@ -52,14 +72,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -167,7 +200,7 @@ json:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
+from ansible.module_utils.common.text.converters import to_native
 
 from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
 
@@ -176,6 +209,9 @@ def main():
     argument_spec = TFEHelper.tfe_argument_spec()
     argument_spec.update(
         organization=dict(type='list', elements='str', no_log=False, default=[ '*' ]),
+        max_workers=dict(type='int', required=False, default=8),
+        stream=dict(type='bool', required=False, default=True),
+        cache_dir=dict(type='path', required=False),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -187,7 +223,6 @@ def main():
     # Parse `organization` parameter and create list of organizations.
     # It's possible someone passed a comma separated string, so we should handle that.
     # This can be either an empty list or '*' which means all organizations.
-    organizations = []
     organizations = [p.strip() for p in module.params['organization']]
     organizations = tfe.listify_comma_sep_strings_in_list(organizations)
     if not organizations:
@@ -203,63 +238,85 @@ def main():
     result['json']['data'] = []
     result['json']['not_found'] = []
 
-    # Retrieve information for all organizations
-    try:        
-        all_organizations = tfe.call_endpoint(tfe.api.orgs.list)
-    except Exception as e:
-        module.fail_json(msg='Unable to list organizations. Error: %s.' % (to_native(e)) )
-
     if '*' in organizations:
 
-        for org in all_organizations['data']:
+        # Retrieve entitlements and module producers of all organizations in parallel.
+        # When streaming, these are requested while the next pages of organizations are still being retrieved.
+        _ep_ent = tfe.api.orgs.entitlements
+        _ep_mp = tfe.api.orgs.show_module_producers
+
+        def details_calls(all_organizations):
+            for org in all_organizations:
+                org_id = org['id']
+                yield (org_id, 'entitlements'), (_ep_ent, dict(org_name=org_id))
+                yield (org_id, 'module_producers'), (_ep_mp, dict(org_name=org_id))
 
-            try:        
-                entitlements = tfe.call_endpoint(tfe.api.orgs.entitlements, org_name=org['id'])
-            except Exception as e:
-                module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (org['id'], to_native(e)) )
+        def stream_orgs(all_organizations):
+            for org in tfe.iter_orgs():
+                all_organizations.append(org)
+                yield org
 
-            try:        
-                module_producers = tfe.call_endpoint(tfe.api.orgs.show_module_producers, org_name=org['id'])
-            except Exception as e:
-                module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (org['id'], to_native(e)) )
-        
-            org['entitlements'] = entitlements['data']
-            org['module_producers'] = module_producers['data']
+        all_organizations = []
+        try:        
+            if module.params['stream']:
+                details = tfe.call_endpoints(details_calls(stream_orgs(all_organizations)))
+            else:
+                all_organizations = tfe.list_orgs()['data']
+                details = tfe.call_endpoints(details_calls(all_organizations))
+        except Exception as e:
+            module.fail_json(msg='Unable to list organizations. Error: %s.' % (to_native(e)) )
+
+        for org in all_organizations:
+            org_id = org['id']
+
+            for kind in ['entitlements', 'module_producers']:
+                if isinstance(details[(org_id, kind)], Exception):
+                    module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (org_id, to_native(details[(org_id, kind)])) )
+
+            org['entitlements'] = details[(org_id, 'entitlements')]['data']
+            org['module_producers'] = details[(org_id, 'module_producers')]['data']
             result['json']['data'].append(org)
 
     else:
-        # Iterate over the supplied organizations to retrieve their details
-        for organization in organizations:
+        try:        
+            orgs_index = tfe.list_orgs_index()
+        except Exception as e:
+            module.fail_json(msg='Unable to list organizations. Error: %s.' % (to_native(e)) )
 
-            # Refer to an organization by its external-id
-            if any(o['attributes']['external-id'] == organization for o in all_organizations['data']):
-                org_name = [o for o in all_organizations['data'] if o['attributes']['external-id'] == organization][0]['id'] 
-            # Refer to an organization by its name
-            else:
-                org_name = organization
+        # Retrieve the supplied organizations in parallel.
+        # An organization may be referred either by its external-id or by its name.
+        org_names = dict((organization, orgs_index['by_ext'].get(organization, {}).get('id', organization)) for organization in organizations)
+        shown = tfe.call_endpoints(dict(
+            (organization, (tfe.api.orgs.show, dict(org_name=org_name))) for organization, org_name in org_names.items()
+        ))
 
-            try:        
-                ret = tfe.call_endpoint(tfe.api.orgs.show, org_name=org_name)
-            except Exception as e:
-                #module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (organization, to_native(e)) )
+        found = []
+        for organization in organizations:
+            ret = shown[organization]
+            if isinstance(ret, Exception):
+                #module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (organization, to_native(ret)) )
                 result['json']['not_found'].append( organization )
-                ret = None
-
-            if ret is not None:
-                try:        
-                    entitlements = tfe.call_endpoint(tfe.api.orgs.entitlements, org_name=org_name)
-                except Exception as e:
-                    module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (organization, to_native(e)) )
-
-                try:        
-                    module_producers = tfe.call_endpoint(tfe.api.orgs.show_module_producers, org_name=org_name)
-                except Exception as e:
-                    module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (organization, to_native(e)) )
-            
-                ret['data']['entitlements'] = entitlements['data']
-                ret['data']['module_producers'] = module_producers['data']
-
-                result['json']['data'].append(ret['data'])            
+            elif ret is not None:
+                found.append(organization)
+
+        # Retrieve details on the existing organizations only, in parallel
+        calls = {}
+        for organization in found:
+            calls[(organization, 'entitlements')] = (tfe.api.orgs.entitlements, dict(org_name=org_names[organization]))
+            calls[(organization, 'module_producers')] = (tfe.api.orgs.show_module_producers, dict(org_name=org_names[organization]))
+        details = tfe.call_endpoints(calls)
+
+        for organization in found:
+
+            ret = shown[organization]
+            for kind in ['entitlements', 'module_producers']:
+                if isinstance(details[(organization, kind)], Exception):
+                    module.fail_json(msg='Unable to retrieve details on "%s" organization. Error: %s.' % (organization, to_native(details[(organization, kind)])) )
+
+            ret['data']['entitlements'] = details[(organization, 'entitlements')]['data']
+            ret['data']['module_producers'] = details[(organization, 'module_producers')]['data']
+
+            result['json']['data'].append(ret['data'])            
            
     module.exit_json(**result)
 
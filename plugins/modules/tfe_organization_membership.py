@@ -61,6 +61,13 @@ options:
     default: present
     choices: [ absent, present ]
     required: true
+  cache_dir:
+    description:
+    - Directory where listings of memberships and teams are cached, e.g. C(~/.ansible/tmp).
+    - When set, each page is requested with the ETag of the cached copy, and it is downloaded again only when it has changed.
+    - By default, nothing is cached on disk.
+    type: path
+    required: false
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated.
@@ -74,14 +81,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -191,39 +211,84 @@ from ansible.module_utils.common.text.converters import to_bytes, to_native, to_
 from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
 
 
-def get_user_details(module, tfe, organization=None, user=None):
+def list_user_memberships(tfe, user=None):
+    """
+    Returns the organization memberships matching the supplied user value, as an object with 'data' and 'included' arrays.
+
+    TFE narrows down the memberships: a membership ID is requested directly, an email is filtered on and a username is searched for.
+    There is no filter on user IDs, memberships are listed page by page until the user is found in that case.
+    A value looking like a membership or user ID may still be a username, it is searched for when no such ID exists.
+    User details are included only when searching for a username, the memberships carry everything else.
+    """
+    if user.startswith('ou-'):
+        membership = tfe.show_membership(org_membership_id=user, include=None)
+        if membership is not None:
+            return dict(data=[membership['data']], included=[])
+    elif '@' in user:
+        # TFE may match the filter loosely, only the exact email is kept
+        memberships = tfe.list_memberships(query=None, filters=[{"keys": ["email"], "value": user}], include=None, cache=False)
+        return dict(data=[m for m in memberships['data'] if m['attributes']['email'] == user], included=[])
+    elif user.startswith('user-'):
+        for page in tfe.iter_pages(tfe.api.org_memberships, url=tfe.api.org_memberships._org_base_url):
+            membership = next((m for m in page['data'] if m['relationships']['user']['data']['id'] == user), None)
+            if membership is not None:
+                return dict(data=[membership], included=[])
+
+    return list_username_memberships(tfe, user=user)
+
+
+def list_username_memberships(tfe, user=None):
+    """
+    Returns the organization memberships found when searching for the supplied username, including the user details.
+
+    A single user is looked up, the result is not cached in 'cache_dir'.
+    """
+    return tfe.list_memberships(query=user, filters=None, include=["user"], cache=False)
+
+
+def list_teams(tfe):
+    """
+    Returns all teams in the organization, as an object with 'data' and 'included' arrays.
+    """
+    return tfe.list_all(tfe.api.teams, url=tfe.api.teams._org_api_v2_base_url, include=None)
+
+
+def get_user_details(module, tfe, organization=None, user=None, all_memberships=None):
     """
     Returns a dictionary with user details including user email, login, ID and the supplied organization membership ID.
 
+    'all_memberships' may provide the response of list_user_memberships(), when it has already been retrieved.
     """
     user_details = {}
 
-    # Search for all organization memberships
-    try:        
-        all_memberships = tfe.call_endpoint(tfe.api.org_memberships.list_all_for_org, query=None, filters=None, include=["user"])
-    except Exception as e:
-        module.fail_json(msg='Unable to list memberships in "%s" organization. Error: %s.' % (organization, to_native(e)) )
+    if all_memberships is None:
+        try:        
+            all_memberships = list_user_memberships(tfe, user=user)
+        except Exception as e:
+            module.fail_json(msg='Unable to list memberships in "%s" organization. Error: %s.' % (organization, to_native(e)) )
 
-    # Try to find organization membership based on the supplied user value
-    if any(m['id'] == user or m['attributes']['email'] == user or m['relationships']['user']['data']['id'] == user for m in all_memberships['data']):
-        user_organization_membership = [m for m in all_memberships['data'] if m['id'] == user or m['attributes']['email'] == user or m['relationships']['user']['data']['id'] == user][0]
-        user_details = dict(
-            email=user_organization_membership['attributes']['email'],
-            id=user_organization_membership['relationships']['user']['data']['id'],
-            username=None,
-            organization_membership_id=user_organization_membership['id']             
-        )
+    index = tfe.build_membership_index(all_memberships)
 
-    if any(i['attributes']['username'] == user for i in all_memberships['included']):
-        included_info = [i for i in all_memberships['included'] if i['attributes']['username'] == user][0]
+    # Resolve the supplied user value with a single chain of lookups: a username takes precedence,
+    # next come the membership ID, email and user ID. A user's membership is found by the user ID.
+    included_info = index['by_username'].get(user)
+    if included_info is not None:
+        user_organization_membership = index['by_user'].get(included_info['id'])
         user_details = dict(
             email=included_info['attributes']['email'],
             id=included_info['id'],
             username=user,
-            organization_membership_id=None             
+            organization_membership_id=None if user_organization_membership is None else user_organization_membership['id']
         )
-        user_organization_membership = [m for m in all_memberships['data'] if m['attributes']['email'] == user_details['email']][0]
-        user_details['organization_membership_id'] = user_organization_membership['id'] 
+    else:
+        user_organization_membership = index['by_id'].get(user) or index['by_email'].get(user) or index['by_user'].get(user)
+        if user_organization_membership is not None:
+            user_details = dict(
+                email=user_organization_membership['attributes']['email'],
+                id=user_organization_membership['relationships']['user']['data']['id'],
+                username=None,
+                organization_membership_id=user_organization_membership['id']             
+            )
 
     return user_details
 
@@ -235,6 +300,7 @@ def main():
         user=dict(type='str', required=True, no_log=False),
         teams=dict(type='list', elements='str', required=False, no_log=False),
         state=dict(type='str', choices=['present', 'absent'], default='present'),
+        cache_dir=dict(type='path', required=False),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -249,9 +315,8 @@ def main():
     user = module.params['user']
     
     if module.params['teams'] is not None:
-        teams = []
-        teams = [p.strip() for p in module.params['teams']]
-        teams = tfe.listify_comma_sep_strings_in_list(teams)
+        # Split any comma separated strings and strip the teams, in a single pass
+        teams = [t.strip() for p in module.params['teams'] for t in p.split(',') if t.strip()]
     else:
         teams = None
 
@@ -266,18 +331,58 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
 
+    all_memberships = None
+    all_teams = None
+
+    # A membership ID needs no list of memberships to be removed. TFE removes a membership of any organization
+    # by its ID though, so it is requested first. When the organization has no such membership, the value
+    # may still be a username, which is searched for below.
+    if (state == 'absent') and user.startswith('ou-'):
+        membership = tfe.safe_call(
+            tfe.show_membership, fail_msg='Unable to retrieve details on "%s" membership in "%s" organization.' % (user, organization),
+            org_membership_id=user, retry=False
+        )
+        if membership is not None:
+            result['changed'] = True
+            if not module.check_mode:
+                result['changed'] = tfe.safe_call(
+                    tfe.remove_membership, fail_msg='Unable to remove "%s" membership from "%s" organization.' % (user, organization), org_membership_id=user
+                )
+            module.exit_json(**result)
+
+        try:
+            all_memberships = list_username_memberships(tfe, user=user)
+        except Exception as e:
+            module.fail_json(msg='Unable to list memberships in "%s" organization. Error: %s.' % (organization, to_native(e)) )
+
+    # The teams are only needed to invite the user, when present. They are retrieved while the user is looked up,
+    # so that both requests overlap.
+    if state == 'present':
+        responses = tfe.call_endpoints({
+            'memberships': (list_user_memberships, dict(tfe=tfe, user=user)),
+            'teams': (list_teams, dict(tfe=tfe)),
+        }, max_workers=2, retry=False)
+        if isinstance(responses['memberships'], Exception):
+            module.fail_json(msg='Unable to list memberships in "%s" organization. Error: %s.' % (organization, to_native(responses['memberships'])) )
+        all_memberships = responses['memberships']
+        all_teams = responses['teams']
+
     # Get user details, such as username, email, ID and membership ID.
-    user_details = get_user_details(module, tfe, organization=organization, user=user)
+    user_details = get_user_details(module, tfe, organization=organization, user=user, all_memberships=all_memberships)
     
     # Remove a User from Organization if membership exists and state == 'absent'
     if (state == 'absent') and (user_details.get('organization_membership_id', None) is not None):
 
         if not module.check_mode:            
-            result['json'] = tfe.call_endpoint(tfe.api.org_memberships.remove, org_membership_id=user_details['organization_membership_id'])
+            result['json'] = tfe.safe_call(
+                tfe.api.org_memberships.remove, fail_msg='Unable to remove "%s" membership from "%s" organization.' % (user, organization),
+                org_membership_id=user_details['organization_membership_id']
+            )
+            tfe.invalidate_memberships_cache()
         result['changed'] = True
  
     # Invite a User to an Organization if membership does not exist and state == 'present'
@@ -301,25 +406,30 @@ def main():
           }
         }
 
-        # Get all teams
-        try:        
-            all_teams = tfe.call_endpoint(tfe.api.teams.list_all, include=None)
-        except Exception as e:
-            module.fail_json(msg='Unable to list teams in "%s" organization. Error: %s.' % (organization, to_native(e)) )
+        # All teams were retrieved along with the user details
+        if isinstance(all_teams, Exception):
+            module.fail_json(msg='Unable to list teams in "%s" organization. Error: %s.' % (organization, to_native(all_teams)) )
+
+        # Index the teams by name and ID once, before resolving the supplied teams
+        team_ids_by_name = {}
+        team_ids = set()
+        for t in all_teams['data']:
+            team_ids_by_name.setdefault(t['attributes']['name'], t['id'])
+            team_ids.add(t['id'])
 
         for team in teams:
-            # Refer to a team by its name
-            if any(t['attributes']['name'] == team for t in all_teams['data']):
-                team_id = [t for t in all_teams['data'] if t['attributes']['name'] == team][0]['id']
-            elif any(t['id'] == team for t in all_teams['data']):
-                team_id = team
-            else:
+            # Refer to a team by its name, next by its ID
+            team_id = team_ids_by_name.get(team) or (team if team in team_ids else None)
+            if team_id is None:
                 module.fail_json(msg='Unable to find "%s" team in "%s" organization.' % (team, organization) )
 
             org_membership_payload['data']['relationships']['teams']['data'].append({'type': 'teams', 'id': team_id})
 
         if not module.check_mode:            
-            result['json'] = tfe.call_endpoint(tfe.api.org_memberships.invite, payload=org_membership_payload)
+            result['json'] = tfe.safe_call(
+                tfe.api.org_memberships.invite, fail_msg='Unable to invite "%s" to "%s" organization.' % (user, organization), payload=org_membership_payload
+            )
+            tfe.invalidate_memberships_cache()
         result['changed'] = True
 
     module.exit_json(**result)
@@ -58,6 +58,13 @@ options:
     type: list
     elements: str
     required: false
+  cache_dir:
+    description:
+    - Directory where listings of memberships are cached, e.g. C(~/.ansible/tmp).
+    - When set, each page is requested with the ETag of the cached copy, and it is downloaded again only when it has changed.
+    - By default, nothing is cached on disk.
+    type: path
+    required: false
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated.
@@ -71,14 +78,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -168,13 +188,17 @@ json:
             elements: dict 
 '''
 
-import collections
-
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
 
 from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
 
+# Types of the nested resources returned for each 'include' value
+INCLUDED_TYPES = {
+    'user': 'users',
+    'teams': 'teams',
+}
+
 
 def main():
     argument_spec = TFEHelper.tfe_argument_spec()
@@ -183,6 +207,7 @@ def main():
         membership=dict(type='list', elements='str', no_log=False, default=[ '*' ]),
         status=dict(type='str', required=False, no_log=False, choices=['invited', 'active']),        
         include=dict(type='list', elements='str', no_log=False, required=False, choices=['user', 'teams']),        
+        cache_dir=dict(type='path', required=False),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -198,10 +223,7 @@ def main():
     # Parse `membership` parameter and create list of memberships.
     # It's possible someone passed a comma separated string, so we should handle that.
     # This can be either an empty list or '*' which means all memberships.
-    memberships = module.params['membership']
-    if isinstance(module.params['membership'], collections.Iterable):
-        memberships = [p.strip() for p in module.params['membership']]
-        memberships = tfe.listify_comma_sep_strings_in_list(memberships)
+    memberships = [m.strip() for p in module.params['membership'] for m in p.split(',') if m.strip()]
     if not memberships:
         memberships = [ '*' ]
 
@@ -230,67 +252,80 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
     
     if '*' in memberships:
         # Retrieve information for all memberships
         try:        
-            result['json'] = tfe.call_endpoint(tfe.api.org_memberships.list_all_for_org, query=None, filters=filters, include=include)
+            result['json'] = tfe.list_memberships(query=None, filters=filters, include=include)
         except Exception as e:
             module.fail_json(msg='Unable to list memberships in "%s" organization. Error: %s.' % (organization, to_native(e)) )
+    elif all(m.startswith('ou-') for m in memberships):
+        # Only membership IDs are supplied, request them directly (and concurrently) instead of listing all memberships
+        result['json']['data'] = []
+        result['json']['included'] = []
+        # show_membership() only returns memberships of the organization, TFE shows a membership of any organization by its ID
+        responses = tfe.call_endpoints(dict(
+            (membership, (tfe.show_membership, dict(org_membership_id=membership, include=include))) for membership in set(memberships)
+        ), retry=False)
+
+        seen = set()
+        for membership in memberships:
+            ret = responses[membership]
+            if isinstance(ret, Exception):
+                module.fail_json(msg='Unable to retrieve details on "%s" membership in "%s" organization. Error: %s.' % (membership, organization, to_native(ret)) )
+            if (ret is None) or ((status is not None) and (ret['data']['attributes']['status'] != status)):
+                module.fail_json(msg='Unable to retrieve details on "%s" membership in "%s" organization.' % (membership, organization) )
+
+            result['json']['data'].append(ret['data'])
+            for i in ret.get('included', []):
+                if (i['type'], i['id']) not in seen:
+                    seen.add((i['type'], i['id']))
+                    result['json']['included'].append(i)
     else:
         result['json']['data'] = []
         result['json']['included'] = []
-        # First, get the list of all memberships
+        # First, get the list of all memberships, along with the requested nested resources.
+        # Users are included as well when a membership is referred to by username, i.e. neither by email nor by ID.
+        prefetch_include = set(include or [])
+        if any(not (('@' in m) or m.startswith(('ou-', 'user-'))) for m in memberships):
+            prefetch_include.add('user')
         try:        
-            all_memberships = tfe.call_endpoint(tfe.api.org_memberships.list_all_for_org, query=None, filters=filters, include=["user"])
+            all_memberships = tfe.list_memberships(query=None, filters=filters, include=sorted(prefetch_include) or None)
         except Exception as e:
             module.fail_json(msg='Unable to list memberships in "%s" organization. Error: %s.' % (organization, to_native(e)) )        
 
-        # Next, iterate over the supplied memberships to retrieve their details
+        # Index the memberships once, so that each supplied membership is looked up in constant time
+        index = tfe.build_membership_index(all_memberships)
+        included = dict(((i['type'], i['id']), i) for i in all_memberships.get('included', []))
+        included_types = set(INCLUDED_TYPES[i] for i in (include or []))
+
+        # Next, pick the details of the supplied memberships from the list, no further request is needed
         for membership in memberships:
 
-            # Refer to a memberships by user email
-            if any(m['attributes']['email'] == membership for m in all_memberships['data']):
-                matching_membership = [m for m in all_memberships['data'] if m['attributes']['email'] == membership][0]['attributes']['email']
-                try:        
-                    ret = tfe.call_endpoint(tfe.api.org_memberships.list_all_for_org, query=matching_membership, filters=filters, include=include)
-                except Exception as e:
-                    module.fail_json(msg='Unable to retrieve details on "%s" membership in "%s" organization. Error: %s.' % (membership, organization, to_native(e)) )
+            # Refer to a memberships by user email, by membership ID or by user ID
+            matching_membership = index['by_email'].get(membership) or index['by_id'].get(membership) or index['by_user'].get(membership)
 
-            # Refer to a memberships by membership ID
-            elif any(m['id'] == membership for m in all_memberships['data']):
-                try:        
-                    ret = tfe.call_endpoint(tfe.api.org_memberships.show, org_membership_id=membership, include=include)
-                except Exception as e:
-                    module.fail_json(msg='Unable to retrieve details on "%s" membership in "%s" organization. Error: %s.' % (membership, organization, to_native(e)) )
+            # Try to find a user by their name
+            if matching_membership is None:
+                included_info = index['by_username'].get(membership)
+                if included_info is not None:
+                    matching_membership = index['by_user'].get(included_info['id'])
 
-            # Try to find a user by their name or ID
-            else:
-                matching_membership = None
-                for m in all_memberships['data']:
-                    user_id = m['relationships']['user']['data']['id']
-                    if user_id == membership:
-                        matching_membership = m['attributes']['email']
-                        break
-                    else:
-                        if any(include['id'] == user_id and include['attributes']['username'] == membership for include in all_memberships['included']):
-                            matching_membership = [include for include in all_memberships['included'] if include['id'] == user_id and include['attributes']['username'] == membership][0]['attributes']['username']
-                            break
+            if matching_membership is None:
+                module.fail_json(msg='Unable to retrieve details on "%s" membership in "%s" organization.' % (membership, organization) )
 
-                if matching_membership is not None:
-                    try:        
-                        ret = tfe.call_endpoint(tfe.api.org_memberships.list_all_for_org, query=matching_membership, filters=filters, include=include)
-                    except Exception as e:
-                        module.fail_json(msg='Unable to retrieve details on "%s" membership in "%s" organization. Error: %s.' % (membership, organization, to_native(e)) )
-                else:
-                    module.fail_json(msg='Unable to retrieve details on "%s" membership in "%s" organization.' % (membership, organization) )
+            result['json']['data'].append(matching_membership)
 
-            result['json']['data'].extend(ret['data'])
-            if include is not None:
-                result['json']['included'].extend(ret['included'])            
+            # Add the requested nested resources of the membership, each of them once
+            for relationship in matching_membership.get('relationships', {}).values():
+                refs = relationship.get('data') or []
+                for ref in (refs if isinstance(refs, list) else [refs]):
+                    key = (ref['type'], ref['id'])
+                    if (ref['type'] in included_types) and (key in included):
+                        result['json']['included'].append(included.pop(key))
 
     module.exit_json(**result)
 
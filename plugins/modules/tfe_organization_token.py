@@ -55,14 +55,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -152,7 +165,7 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
 
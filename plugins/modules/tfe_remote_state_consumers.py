@@ -60,6 +60,20 @@ options:
     default: add
     choices: [ add, delete, replace ]
     required: true
+  cache_dir:
+    description:
+    - Directory where the list of workspaces is cached, e.g. C(~/.ansible/tmp).
+    - When set, modules run against the same organization within C(cache_ttl) seconds reuse the cached list instead of listing workspaces again.
+    - By default, nothing is cached on disk.
+    type: path
+    required: false
+  cache_ttl:
+    description:
+    - Number of seconds the list of workspaces cached in C(cache_dir) is used for.
+    - C(0) disables the cache.
+    type: int
+    default: 30
+    required: false
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated.
@@ -73,14 +87,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -143,7 +170,7 @@ remote_state_consumers:
         - my-workspace-2       
 '''
 
-import collections
+from collections.abc import Iterable
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
@@ -151,6 +178,14 @@ from ansible.module_utils.common.text.converters import to_bytes, to_native, to_
 from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
 
 
+def list_remote_state_consumers(tfe, workspace_id=None):
+    """
+    Returns all Remote State Consumers of the given workspace, as an object with 'data' and 'included' arrays.
+    """
+    rsc_url = "%s/%s/relationships/remote-state-consumers" % (tfe.api.workspaces._ws_api_v2_base_url, workspace_id)
+    return tfe.list_all(tfe.api.workspaces, url=rsc_url, page_size=100)
+
+
 def main():
     argument_spec = TFEHelper.tfe_argument_spec()
     argument_spec.update(
@@ -158,6 +193,8 @@ def main():
         workspace=dict(type='str', required=True, no_log=False),
         remote_state_consumer=dict(type='list', elements='str', no_log=False, default=[ '*' ]), 
         action=dict(type='str', choices=['add', 'delete', 'replace'], default='add'),
+        cache_dir=dict(type='path', required=False),
+        cache_ttl=dict(type='int', required=False, default=30),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -174,8 +211,8 @@ def main():
     # It's possible someone passed a comma separated string, so we should handle that.
     # This can be either an empty list or '*' which means all Remote State Consumers.
     remote_state_consumers = module.params['remote_state_consumer']
-    if isinstance(module.params['remote_state_consumer'], collections.Iterable):
-        remote_state_consumers = [p.strip() for p in module.params['remote_state_consumer']]
+    if isinstance(remote_state_consumers, Iterable):
+        remote_state_consumers = [p.strip() for p in remote_state_consumers]
         remote_state_consumers = tfe.listify_comma_sep_strings_in_list(remote_state_consumers)
     if not remote_state_consumers:
         remote_state_consumers = [ '*' ]
@@ -192,72 +229,95 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
 
-    # Get the list of all workspaces without additional details
-    try:        
-        all_workspaces = tfe.call_endpoint(tfe.api.workspaces.list_all, include=None)
-    except Exception as e:
-        module.fail_json(msg='Unable to list workspaces in "%s" organization. Error: %s.' % (organization, to_native(e)) )
-
-    # Get existing workspace ID. 
-    workspace_id = None
-    # Refer to a workspace by its name
-    if any(w['attributes']['name'] == workspace for w in all_workspaces['data']):
-        workspace_id = [w for w in all_workspaces['data'] if w['attributes']['name'] == workspace][0]['id']
-    # Refer to a workspace by its ID
-    elif any(w['id'] == workspace for w in all_workspaces['data']):
-        workspace_id = workspace
+    current_remote_state_consumers = None
+    if ('*' not in remote_state_consumers) and all(tfe.is_workspace_id(w) for w in remote_state_consumers):
+        # All consumers are referred to by their IDs, there is no need to list workspaces to look them up
+        workspaces_index = dict(by_name={}, by_id=dict.fromkeys(remote_state_consumers))
+
+        # Get existing workspace ID
+        try:
+            workspace_id = tfe.resolve_workspace_id(workspace=workspace)
+        except Exception as e:
+            module.fail_json(msg='Unable to retrieve details on "%s" workspace in "%s" organization. Error: %s.' % (workspace, organization, to_native(e)) )
+
     else:
+        # Get the list of all workspaces without additional details.
+        # When the workspace is referred to by its ID, its current Remote State Consumers do not depend on the list,
+        # so both are retrieved concurrently.
+        calls = dict(workspaces=(tfe.list_workspaces, dict()))
+        if tfe.is_workspace_id(workspace):
+            calls['consumers'] = (list_remote_state_consumers, dict(tfe=tfe, workspace_id=workspace))
+        responses = tfe.call_endpoints(calls, max_workers=len(calls), retry=False)
+
+        all_workspaces = responses['workspaces']
+        if isinstance(all_workspaces, Exception):
+            module.fail_json(msg='Unable to list workspaces in "%s" organization. Error: %s.' % (organization, to_native(all_workspaces)) )
+        current_remote_state_consumers = responses.get('consumers')
+
+        # Index the workspaces once, so that each workspace is looked up in constant time
+        workspaces_index = tfe.build_workspace_index(all_workspaces)
+
+        # Get existing workspace ID
+        workspace_id = tfe.find_workspace_id(workspaces_index, workspace)
+
+    if workspace_id is None:
         module.fail_json(msg='The supplied "%s" workspace does not exist in "%s" organization.' % (workspace, organization) )
 
+    # Remote State Consumers of the workspace, on the configured TFE instance
+    rsc_url = "%s/%s/relationships/remote-state-consumers" % (tfe.api.workspaces._ws_api_v2_base_url, workspace_id)
+
     # Build Remote State Consumers payload data
-    remote_state_consumers_data_payload = []
-    remote_state_consumers_ids = []
     if '*' in remote_state_consumers:
-        for w in all_workspaces['data']:
-            if w['id'] != workspace_id:
-                remote_state_consumers_data_payload.append({ "id": w['id'], "type": "workspaces"})
-                remote_state_consumers_ids.append(w['id'])
+        remote_state_consumers_ids = [w['id'] for w in all_workspaces['data'] if w['id'] != workspace_id]
 
     else:
-        for rsc in remote_state_consumers:
-            # Refer to a workspace by its name
-            if any(w['attributes']['name'] == rsc for w in all_workspaces['data']):
-                rsc_id = [w for w in all_workspaces['data'] if w['attributes']['name'] == rsc][0]['id']
-            # Refer to a workspace by its ID
-            elif any(w['id'] == rsc for w in all_workspaces['data']):
-                rsc_id = rsc
-            else:
+        # Refer to a workspace by its name, next by its ID
+        resolved_ids = [tfe.find_workspace_id(workspaces_index, rsc) for rsc in remote_state_consumers]
+        for rsc, rsc_id in zip(remote_state_consumers, resolved_ids):
+            if rsc_id is None:
                 module.fail_json(msg='The supplied "%s" workspace does not exist in "%s" organization.' % (rsc, organization) )
+        # The same workspace may be referred to more than once (e.g. by its name and its ID), send it only once
+        remote_state_consumers_ids = list(dict.fromkeys(rsc_id for rsc_id in resolved_ids if rsc_id != workspace_id))
 
-            if rsc_id != workspace_id:
-                remote_state_consumers_data_payload.append({ "id": rsc_id, "type": "workspaces"})
-                remote_state_consumers_ids.append(rsc_id)
+    remote_state_consumers_data_payload = [{ "id": rsc_id, "type": "workspaces"} for rsc_id in remote_state_consumers_ids]
 
     rsc_payload = {
       "data": remote_state_consumers_data_payload
     }
 
-    # Get the list of current Remote State Consumers for the supplied workspace
-    try:        
-        current_remote_state_consumers = tfe.call_endpoint(tfe.api.workspaces._list_all, url=tfe.TFE_URL + "/api/v2/workspaces/" + workspace_id + "/relationships/remote-state-consumers")
-    except Exception as e:
-        module.fail_json(msg='Unable to retrieve details on Remote State Consumers in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
-    current_remote_state_consumers_ids = [w['id'] for w in current_remote_state_consumers['data']]
+    # Nothing to add or delete (e.g. only the workspace itself was supplied), whatever the current Remote State Consumers are
+    if (not remote_state_consumers_ids) and (action in ('add', 'delete')):
+        module.exit_json(**result)
+
+    # Get the list of current Remote State Consumers for the supplied workspace, unless it was retrieved along with the workspaces
+    if current_remote_state_consumers is None:
+        try:        
+            current_remote_state_consumers = list_remote_state_consumers(tfe, workspace_id=workspace_id)
+        except Exception as e:
+            module.fail_json(msg='Unable to retrieve details on Remote State Consumers in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
+    elif isinstance(current_remote_state_consumers, Exception):
+        module.fail_json(msg='Unable to retrieve details on Remote State Consumers in "%s" workspace. Error: %s.' % (workspace, to_native(current_remote_state_consumers)) )
+    current_remote_state_consumers_ids = frozenset(w['id'] for w in current_remote_state_consumers['data'])
+    remote_state_consumers_ids_set = frozenset(remote_state_consumers_ids)
+
+    # Compute the difference between requested and current consumers once, every action branches on it
+    missing_remote_state_consumers_ids = remote_state_consumers_ids_set - current_remote_state_consumers_ids
+    present_remote_state_consumers_ids = remote_state_consumers_ids_set & current_remote_state_consumers_ids
 
     # Add Remote State Consumers
     if action == 'add':
 
-        # Check if 'remote_state_consumers_ids' is a subset of 'current_remote_state_consumers_ids', i.e. if there is any change
-        if not tfe.is_subset(subset=remote_state_consumers_ids, superset=current_remote_state_consumers_ids):
+        # Check if any of 'remote_state_consumers_ids' is missing from 'current_remote_state_consumers_ids', i.e. if there is any change
+        if missing_remote_state_consumers_ids:
 
             if not module.check_mode:
                 try:        
                     #result['json'] = tfe.call_endpoint(tfe.api.workspaces.add_remote_state_consumers, workspace_id=workspace_id, payload=rsc_payload)
-                    result['json'] = tfe.call_endpoint(tfe.api.workspaces._post, url=tfe.TFE_URL + "/api/v2/workspaces/" + workspace_id + "/relationships/remote-state-consumers", data=rsc_payload)
+                    result['json'] = tfe.call_endpoint(tfe.api.workspaces._post, url=rsc_url, data=rsc_payload)
                 except Exception as e:
                     module.fail_json(msg='Unable to add Remote State Consumers to "%s" workspace in "%s" organization. Error: %s.' % (workspace, organization, to_native(e)) )          
 
@@ -266,13 +326,38 @@ def main():
     # Replace Remote State Consumers
     if action == 'replace':
 
-        # Check if 'remote_state_consumers_ids' is the same as 'current_remote_state_consumers_ids', i.e. if there is any change
-        if not remote_state_consumers_ids == current_remote_state_consumers_ids:
+        # Check if 'remote_state_consumers_ids' is the same as 'current_remote_state_consumers_ids', i.e. if there is any change.
+        # The order of consumers does not matter.
+        if remote_state_consumers_ids_set != current_remote_state_consumers_ids:
+
+            extra_remote_state_consumers_ids = current_remote_state_consumers_ids - remote_state_consumers_ids_set
+
+            if module.check_mode:
+                pass
+
+            elif len(missing_remote_state_consumers_ids) + len(extra_remote_state_consumers_ids) < len(remote_state_consumers_ids_set) / 2:
+                # Only a few consumers differ, add the missing ones and then delete the extra ones
+                # rather than sending the whole list again. Should either request fail, the PATCH below
+                # puts the workspace into the requested state anyway.
+                try:
+                    if missing_remote_state_consumers_ids:
+                        result['json'] = tfe.call_endpoint(tfe.api.workspaces._post, url=rsc_url, data={
+                            "data": [d for d in remote_state_consumers_data_payload if d['id'] in missing_remote_state_consumers_ids]
+                        })
+                    if extra_remote_state_consumers_ids:
+                        result['json'] = tfe.call_endpoint(tfe.api.workspaces._delete, url=rsc_url, data={
+                            "data": [{ "id": rsc_id, "type": "workspaces"} for rsc_id in sorted(extra_remote_state_consumers_ids)]
+                        })
+                except Exception:
+                    try:
+                        result['json'] = tfe.call_endpoint(tfe.api.workspaces._patch, url=rsc_url, data=rsc_payload)
+                    except Exception as e:
+                        module.fail_json(msg='Unable to replace Remote State Consumers in "%s" workspace in "%s" organization. Error: %s.' % (workspace, organization, to_native(e)) )
 
-            if not module.check_mode:
+            else:
                 try:        
                     #result['json'] = tfe.call_endpoint(tfe.api.workspaces.replace_remote_state_consumers, workspace_id=workspace_id, payload=rsc_payload)
-                    result['json'] = tfe.call_endpoint(tfe.api.workspaces._patch, url=tfe.TFE_URL + "/api/v2/workspaces/" + workspace_id + "/relationships/remote-state-consumers", data=rsc_payload)
+                    result['json'] = tfe.call_endpoint(tfe.api.workspaces._patch, url=rsc_url, data=rsc_payload)
                 except Exception as e:
                     module.fail_json(msg='Unable to replace Remote State Consumers in "%s" workspace in "%s" organization. Error: %s.' % (workspace, organization, to_native(e)) )          
 
@@ -281,13 +366,17 @@ def main():
     # Delete Remote State Consumers
     if action == 'delete':
 
-        # Check if 'remote_state_consumers_ids' is a subset of 'current_remote_state_consumers_ids', i.e. if there is any change
-        if tfe.is_subset(subset=remote_state_consumers_ids, superset=current_remote_state_consumers_ids):
+        # Check if any of 'remote_state_consumers_ids' is in 'current_remote_state_consumers_ids', i.e. if there is any change.
+        # Only those consumers are deleted.
+        if present_remote_state_consumers_ids:
 
             if not module.check_mode:
+                rsc_payload = {
+                  "data": [d for d in remote_state_consumers_data_payload if d['id'] in present_remote_state_consumers_ids]
+                }
                 try:        
                     #result['json'] = tfe.call_endpoint(tfe.api.workspaces.delete_remote_state_consumers, workspace_id=workspace_id, payload=rsc_payload)
-                    result['json'] = tfe.call_endpoint(tfe.api.workspaces._delete, url=tfe.TFE_URL + "/api/v2/workspaces/" + workspace_id + "/relationships/remote-state-consumers", data=rsc_payload)
+                    result['json'] = tfe.call_endpoint(tfe.api.workspaces._delete, url=rsc_url, data=rsc_payload)
                 except Exception as e:
                     module.fail_json(msg='Unable to delete Remote State Consumers from "%s" workspace in "%s" organization. Error: %s.' % (workspace, organization, to_native(e)) )          
 
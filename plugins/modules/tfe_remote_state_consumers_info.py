@@ -41,6 +41,20 @@ options:
     - The Workspace name or ID.
     type: str
     required: true
+  cache_dir:
+    description:
+    - Directory where the list of workspaces is cached, e.g. C(~/.ansible/tmp).
+    - When set, modules run against the same organization within C(cache_ttl) seconds reuse the cached list instead of listing workspaces again.
+    - By default, nothing is cached on disk.
+    type: path
+    required: false
+  cache_ttl:
+    description:
+    - Number of seconds the list of workspaces cached in C(cache_dir) is used for.
+    - C(0) disables the cache.
+    type: int
+    default: 30
+    required: false
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated.
@@ -54,14 +68,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -114,6 +141,8 @@ def main():
     argument_spec.update(
         organization=dict(type='str', required=True, no_log=False),
         workspace=dict(type='str', required=True, no_log=False),
+        cache_dir=dict(type='path', required=False),
+        cache_ttl=dict(type='int', required=False, default=30),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -135,31 +164,20 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
 
-    # Get the list of all workspaces without additional details
-    try:        
-        all_workspaces = tfe.call_endpoint(tfe.api.workspaces.list_all, include=None)
-    except Exception as e:
-        module.fail_json(msg='Unable to list workspaces in "%s" organization. Error: %s.' % (organization, to_native(e)) )
-
-    # Get existing workspace ID. 
-    workspace_id = None
-    # Refer to a workspace by its name
-    if any(w['attributes']['name'] == workspace for w in all_workspaces['data']):
-        workspace_id = [w for w in all_workspaces['data'] if w['attributes']['name'] == workspace][0]['id']
-    # Refer to a workspace by its ID
-    elif any(w['id'] == workspace for w in all_workspaces['data']):
-        workspace_id = workspace
-    else:
-        module.fail_json(msg='The supplied "%s" workspace does not exist in "%s" organization.' % (workspace, organization) )
+    # Get existing workspace ID
+    workspace_id = tfe.get_workspace_id_or_fail(workspace=workspace)
+
+    # Remote State Consumers of the workspace, on the configured TFE instance
+    rsc_url = "%s/%s/relationships/remote-state-consumers" % (tfe.api.workspaces._ws_api_v2_base_url, workspace_id)
 
     try:        
         #result['json'] = tfe.call_endpoint(tfe.api.workspaces.get_remote_state_consumers, workspace_id=workspace_id)
         #result['json'] = tfe.call_endpoint(tfe.api.workspaces._get, url=tfe.TFE_URL + "/api/v2/workspaces/" + workspace_id + "/relationships/remote-state-consumers")
-        result['json'] = tfe.call_endpoint(tfe.api.workspaces._list_all, url=tfe.TFE_URL + "/api/v2/workspaces/" + workspace_id + "/relationships/remote-state-consumers")
+        result['json'] = tfe.list_all(tfe.api.workspaces, url=rsc_url, page_size=100)
     except Exception as e:
         module.fail_json(msg='Unable to retrieve details on Remote State Consumers in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
 
@@ -108,14 +108,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -234,6 +247,26 @@ from ansible.module_utils.common.text.converters import to_bytes, to_native, to_
 
 from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
 
+# Types of the documented run attributes, see validate_attributes()
+ATTRIBUTE_TYPES = {
+    'is-destroy': (bool, 'bool'),
+    'message': (str, 'str'),
+    'refresh': (bool, 'bool'),
+    'refresh-only': (bool, 'bool'),
+    'replace-addrs': (list, 'list'),
+    'target-addrs': (list, 'list'),
+}
+
+
+def validate_attributes(module, attributes=None):
+    """
+    Fails the module when any of the documented run attributes is of the wrong type, before any request is sent.
+    """
+    for name, value in (attributes or {}).items():
+        expected_type, type_name = ATTRIBUTE_TYPES.get(name, (object, None))
+        if (value is not None) and not isinstance(value, expected_type):
+            module.fail_json(msg='The "%s" run attribute must be of type %s, got: %s.' % (name, type_name, to_native(value)) )
+
 
 def main():
     argument_spec = TFEHelper.tfe_argument_spec()
@@ -259,6 +292,9 @@ def main():
                      ('action', 'create', ('attributes',), True)],        
     )
 
+    # Validate the parameters first, there is no point in calling TFE with malformed ones
+    validate_attributes(module, attributes=module.params['attributes'])
+
     tfe = TFEHelper(module)
 
     organization = tfe.get_org_name_when_exists(organization=module.params['organization'])
@@ -281,30 +317,17 @@ def main():
     if comment is not None:
         result['comment'] = comment        
     if attributes is not None:
-        result['attributes'] = attributes.copy()
+        # Not a copy, the attributes returned are the ones sent (e.g. along with the default message)
+        result['attributes'] = attributes
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
 
-    # Get the list of all workspaces without additional details
-    try:        
-        all_workspaces = tfe.call_endpoint(tfe.api.workspaces.list_all, include=None)
-    except Exception as e:
-        module.fail_json(msg='Unable to list workspaces in "%s" organization. Error: %s.' % (organization, to_native(e)) )
-
-    # Get existing workspace ID. 
-    workspace_id = None
-    # Refer to a workspace by its name
-    if any(w['attributes']['name'] == workspace for w in all_workspaces['data']):
-        workspace_id = [w for w in all_workspaces['data'] if w['attributes']['name'] == workspace][0]['id']
-    # Refer to a workspace by its ID
-    elif any(w['id'] == workspace for w in all_workspaces['data']):
-        workspace_id = workspace
-    else:
-        module.fail_json(msg='The supplied "%s" workspace does not exist in "%s" organization.' % (workspace, organization) )
+    # Get existing workspace ID. Refer to a workspace by its name, next by its ID
+    workspace_id = tfe.get_workspace_id_or_fail(workspace=workspace)
  
     # Create a run
     if (action == 'create'):
@@ -328,48 +351,42 @@ def main():
         }
 
         if not module.check_mode:
-            try:        
-                result['json'] = tfe.call_endpoint(tfe.api.runs.create, payload=r_payload)
-            except Exception as e:
-                module.fail_json(msg='Unable to create a run in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )    
+            result['json'] = tfe.safe_call(
+                tfe.api.runs.create, fail_msg='Unable to create a run in "%s" workspace.' % (workspace),
+                payload=r_payload
+            )
 
         result['changed'] = True
 
     # Apply/Discard/Cancel/Force-cancel a plan
-    if action in ['apply', 'discard', 'cancel', 'force-cancel', 'force-execute']:
-
-        # Check if the run exists
-        try:        
-            tfe.call_endpoint(tfe.api.runs.show, run_id=run, include=None)
-        except Exception as e:
-            module.fail_json(msg='Unable to retrieve details on a run in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
+    if action != 'create':
 
+        # There is no need to check if the run exists beforehand, the action fails on a missing run.
+        # In check mode, retrieving its details below does.
         r_payload = {}
         if comment is not None:
             r_payload = {
               "comment": comment
             }
 
+        # Endpoint called for each action, along with its arguments
+        r_actions = {
+            'apply': (tfe.api.runs.apply, dict(run_id=run, payload=r_payload)),
+            'discard': (tfe.api.runs.discard, dict(run_id=run, payload=r_payload)),
+            'cancel': (tfe.api.runs.cancel, dict(run_id=run, payload=r_payload)),
+            'force-cancel': (tfe.api.runs.force_cancel, dict(run_id=run, payload=r_payload)),
+            'force-execute': (tfe.api.runs.force_execute, dict(run_id=run)),
+        }
+
         if not module.check_mode:
-            try:        
-                if action == 'apply':
-                  tfe.call_endpoint(tfe.api.runs.apply, run_id=run, payload=r_payload)
-                if action == 'discard':
-                  tfe.call_endpoint(tfe.api.runs.discard, run_id=run, payload=r_payload)
-                if action == 'cancel':
-                  tfe.call_endpoint(tfe.api.runs.cancel, run_id=run, payload=r_payload)
-                if action == 'force-cancel':
-                  tfe.call_endpoint(tfe.api.runs.force_cancel, run_id=run, payload=r_payload)                
-                if action == 'force-execute':
-                  tfe.call_endpoint(tfe.api.runs.force_execute, run_id=run)                   
-            except Exception as e:
-                module.fail_json(msg='Unable to "%s" "%s" run in "%s" workspace. Error: %s.' % (action, run, workspace, to_native(e)) )    
+            endpoint, kwargs = r_actions[action]
+            tfe.safe_call(endpoint, fail_msg='Unable to "%s" "%s" run in "%s" workspace.' % (action, run, workspace), **kwargs)
 
         # Get details of the run
-        try:        
-            result['json'] = tfe.call_endpoint(tfe.api.runs.show, run_id=run, include=['plan', 'apply'])
-        except Exception as e:
-            module.fail_json(msg='Unable to retrieve details on a run in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
+        result['json'] = tfe.safe_call(
+            tfe.api.runs.show, fail_msg='Unable to retrieve details on a run in "%s" workspace.' % (workspace),
+            run_id=run, include=['plan', 'apply']
+        )
 
         result['changed'] = True
 
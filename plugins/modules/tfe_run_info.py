@@ -57,6 +57,20 @@ options:
     type: list
     elements: str
     required: false
+  cache_dir:
+    description:
+    - Directory where the list of workspaces is cached, e.g. C(~/.ansible/tmp).
+    - When set, modules run against the same organization within C(cache_ttl) seconds reuse the cached list instead of listing workspaces again.
+    - By default, nothing is cached on disk, and the given workspace is requested directly instead of listing all workspaces.
+    type: path
+    required: false
+  cache_ttl:
+    description:
+    - Number of seconds the list of workspaces cached in C(cache_dir) is used for.
+    - C(0) disables the cache.
+    type: int
+    default: 30
+    required: false
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated.
@@ -70,14 +84,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -237,13 +264,22 @@ json:
             elements: dict 
 '''
 
+import re
+from collections import defaultdict, deque
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
-from ansible.module_utils.six import PY3, PY2, iteritems, string_types
 
 from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
 
 
+# Run IDs, e.g. run-CZcmD7eagjhyX0vN
+RUN_ID_RE = re.compile(r'^run-[A-Za-z0-9]{16}$')
+
+# All resources related to a run which may be included along with it
+INCLUDE_CHOICES = ('plan', 'apply', 'created_by', 'cost_estimate', 'configuration_version', 'configuration_version.ingress_attributes')
+
+
 def restrict_results(filter=None, result_input=None):
     """
     Restricts results (run details) to those with the matching filter values.
@@ -252,66 +288,123 @@ def restrict_results(filter=None, result_input=None):
     """
     # Seed the output result dict
     result_ouput = dict( data=[], included=[] )
+    # IDs of resources already added to the output lists, for constant-time membership checks
+    included_ids = set()
+    data_ids = set()
+
+    # No run can match when there are no nested resources
+    if not result_input.get('included'):
+        return result_ouput
+
+    # First, turn the filters into a table of attribute values to match, per resource type.
+    # The key of a resource type might be either an 'id' of the resource ..
+    #  .. or one of the resource attribute name - so we should handle both cases
+    filter_table = defaultdict(list)
+    for resource_type, resource_attributes in filter.items():
+        if isinstance(resource_attributes, dict):
+            for attribute_name, attribute_value_list in resource_attributes.items():
+                try:
+                    attribute_values = set(attribute_value_list)
+                except TypeError:
+                    # Unhashable values (e.g. dicts) are compared one by one
+                    attribute_values = list(attribute_value_list)
+                filter_table[resource_type].append((attribute_name, attribute_values))
+
+    # Next, iterate once over 'included' resources to find those matching the supplied filters
+    for included_item in result_input['included']:
+        for attribute_name, attribute_values in filter_table.get(included_item.get('type', None), []):
+            if attribute_name == 'id':
+                value = included_item.get('id', None)
+            else:
+                value = included_item['attributes'].get(attribute_name, None)
 
-    # First, iterate over 'included' resources to find those matching the supplied filters
-    for resource_type, resource_attributes in iteritems(filter):
-        for included_item in result_input['included']:
-            if included_item.get('type', None) == resource_type and isinstance(resource_attributes, dict):
+            try:
+                matched = value in attribute_values
+            except TypeError:
+                # An unhashable value (e.g. a dict) is not equal to any of the hashable filter values
+                matched = False
 
-                # Once matching resource type if found, iterate over provided dict keys of the given resource type.
-                #  The key might be either an 'id' of the resource ..
-                #  .. or one of the resource attribute name - so we should handle both cases
-                for attribute_name, attribute_value_list in iteritems(resource_attributes):
-                    if attribute_name == 'id' and any(a == included_item.get('id', None) for a in attribute_value_list):
-                        result_ouput['included'].append(included_item)
-                    if attribute_name != 'id' and any(a == included_item['attributes'].get(attribute_name, None) for a in attribute_value_list):
-                        result_ouput['included'].append(included_item)
+            if matched:
+                result_ouput['included'].append(included_item)
+                included_ids.add(included_item['id'])
+                break
+
+    # No run can match when no nested resource matches the filters
+    if not result_ouput['included']:
+        return result_ouput
 
     # Once all matching 'included' resources are identified, we need to find all their 'parent' and 'grand-parent' (etc) resources
     # to form a complete list of dependencies
-    relationships_found = True
-    while relationships_found:
-        relationships_found = False
-
-        for included_item in result_input['included']:
-            for rk, rv in iteritems( included_item.get('relationships', None)):
-                if isinstance(rv.get('data', []), list):
-                    rv_list = rv.get('data', [])
-                else:
-                    rv_list = [ rv['data'] ]
-
-                for parent_resource in rv_list:
-                    if any(ri['id'] == parent_resource['id'] for ri in result_ouput['included']) and not any(ri['id'] == included_item['id'] for ri in result_ouput['included']):
-                        result_ouput['included'].append(included_item)
-                        relationships_found = True
+    # Index 'included' resources by the IDs of the resources they refer to, so that each relationship is walked only once
+    children_by_parent = defaultdict(list)
+    for included_item in result_input['included']:
+        for rk, rv in included_item.get('relationships', {}).items():
+            # A relationship refers to a list of resources, a single resource, or none (e.g. links only)
+            rv_data = rv.get('data', None)
+            if rv_data is None:
+                continue
+            rv_list = rv_data if isinstance(rv_data, list) else ( rv_data, )
+
+            for parent_resource in rv_list:
+                children_by_parent[parent_resource['id']].append(included_item)
+
+    # Only the newly added resources need to be checked for further dependencies
+    pending = deque(result_ouput['included'])
+    while pending:
+        parent_resource = pending.popleft()
+
+        for included_item in children_by_parent.get(parent_resource['id'], []):
+            if included_item['id'] not in included_ids:
+                result_ouput['included'].append(included_item)
+                included_ids.add(included_item['id'])
+                pending.append(included_item)
 
     # Finally, we need to search for all runs (i.e. 'data' list) matching identified dependant resources from result_ouput['included'] list created above
     for run_item in result_input['data']:
-        for rk, rv in iteritems( run_item.get('relationships', None)):
-            if isinstance(rv.get('data', []), list):
-                rv_list = rv.get('data', [])
-            else:
-                rv_list = [ rv['data'] ]
+        for rk, rv in run_item.get('relationships', {}).items():
+            # A relationship refers to a list of resources, a single resource, or none (e.g. links only)
+            rv_data = rv.get('data', None)
+            if rv_data is None:
+                continue
+            rv_list = rv_data if isinstance(rv_data, list) else ( rv_data, )
 
             for child_resource in rv_list:
-                if any(ri['id'] == child_resource['id'] for ri in result_ouput['included']):
+                if child_resource['id'] in included_ids and run_item['id'] not in data_ids:
                     # Add matching 'run' details item the the output list
                     result_ouput['data'].append(run_item)
+                    data_ids.add(run_item['id'])
 
     return result_ouput
 
 
+def remove_duplicates(items=None):
+    """
+    Removes resources with an already seen ID from the given list, keeping the order of the first occurrences.
+
+    """
+    seen = set()
+    unique_items = []
+    for item in items:
+        if item['id'] not in seen:
+            seen.add(item['id'])
+            unique_items.append(item)
+
+    return unique_items
+
+
 def main():
     argument_spec = TFEHelper.tfe_argument_spec()
     argument_spec.update(
         organization=dict(type='str', required=True, no_log=False),
         workspace=dict(type='str', required=True, no_log=False),
         run=dict(type='list', elements='str', no_log=False, default=[ '*' ]),
-        include=dict(type='list', elements='str', no_log=False, required=False, choices=['plan', 'apply', 'created_by', 'cost_estimate', 'configuration_version', 'configuration_version.ingress_attributes']),
+        include=dict(type='list', elements='str', no_log=False, required=False, choices=list(INCLUDE_CHOICES)),
         filter=dict(
             type='dict', 
             required=False, no_log=False,
         ),
+        cache_dir=dict(type='path', required=False),
+        cache_ttl=dict(type='int', required=False, default=30),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -347,30 +440,16 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
     
-    # Get the list of all workspaces without additional details
-    try:        
-        all_workspaces = tfe.call_endpoint(tfe.api.workspaces.list_all, include=None)
-    except Exception as e:
-        module.fail_json(msg='Unable to list workspaces in "%s" organization. Error: %s.' % (organization, to_native(e)) )
-
-    # Get existing workspace ID. 
-    workspace_id = None
-    # Refer to a workspace by its name
-    if any(w['attributes']['name'] == workspace for w in all_workspaces['data']):
-        workspace_id = [w for w in all_workspaces['data'] if w['attributes']['name'] == workspace][0]['id']
-    # Refer to a workspace by its ID
-    elif any(w['id'] == workspace for w in all_workspaces['data']):
-        workspace_id = workspace
-    else:
-        module.fail_json(msg='The supplied "%s" workspace does not exist in "%s" organization.' % (workspace, organization) )
+    # Get existing workspace ID, referring to a workspace by its name or its ID
+    workspace_id = tfe.get_workspace_id_or_fail(workspace=workspace)
 
     # To properly filter out run data, we need to collect all related resource
     if filter is not None:
-        include = ['plan', 'apply', 'created_by', 'cost_estimate', 'configuration_version', 'configuration_version.ingress_attributes']
+        include = INCLUDE_CHOICES
 
     # Process all runs
     if '*' in runs:
@@ -381,62 +460,58 @@ def main():
         except Exception as e:
             module.fail_json(msg='Unable to list runs in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
 
-        # Restrict results when as specified by filter. Otherwise, output the complte result set
-        if filter is not None:
-            result['json'] = restrict_results(filter=filter, result_input=result_json)
-        else:
-            result['json'] = result_json
-
-
     # Process the given runs
     else:
-        # First, get the list of all runs without additional details
-        try:        
-            all_runs = tfe.call_endpoint(tfe.api.runs.list_all, workspace_id=workspace_id, include=None)
-        except Exception as e:
-            module.fail_json(msg='Unable to list runs in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
+        # First, get the list of all runs without additional details, and with their messages only.
+        # It is only needed to find runs by their custom messages, i.e. not when all runs are referred to by their IDs.
+        all_runs = dict(data=[])
+        if not all(RUN_ID_RE.match(r) for r in runs):
+            try:        
+                all_runs = tfe.list_all(
+                    tfe.api.runs, url='%s/%s/runs' % (tfe.api.runs._ws_api_v2_base_url, workspace_id), include=None, fields={'runs': ['message']}
+                )
+            except Exception as e:
+                module.fail_json(msg='Unable to list runs in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
 
         result_json = dict( data=[], included=[] )
 
-        # Next, iterate over the supplied runs to retrieve their details
+        # Index runs by their custom messages, as several runs may share the same message
+        runs_by_message = defaultdict(list)
+        for r in all_runs['data']:
+            runs_by_message[r['attributes']['message']].append(r)
+
+        # Next, collect the IDs of the supplied runs.
+        # A run is referred to by its custom message, otherwise by its ID.
+        run_ids = []
         for run in runs:
+            if run in runs_by_message:
+                run_ids.extend(r['id'] for r in runs_by_message[run])
+            else:
+                run_ids.append(run)
 
-            # Refer to a run by its custom message
-            if any(r['attributes']['message'] == run for r in all_runs['data']):
-                for selected_run in [r for r in all_runs['data'] if r['attributes']['message'] == run]:
-                    try:        
-                        ret = tfe.call_endpoint(tfe.api.runs.show, run_id=selected_run['id'], include=include)
-                    except Exception as e:
-                        module.fail_json(msg='Unable to retrieve details on a run in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
+        # Retrieve details on the runs concurrently
+        responses = tfe.call_endpoints(dict(
+            (run_id, (tfe.api.runs.show, dict(run_id=run_id, include=include))) for run_id in set(run_ids)
+        ))
 
-                    result_json['data'].append(ret['data'])
-                    if include is not None:
-                        result_json['included'].extend(ret['included']) 
+        for run_id in run_ids:
+            ret = responses[run_id]
+            if isinstance(ret, Exception):
+                module.fail_json(msg='Unable to retrieve details on a run in "%s" workspace. Error: %s.' % (workspace, to_native(ret)) )
 
-            # Refer to a run by its ID
-            else:
-                try:        
-                    ret = tfe.call_endpoint(tfe.api.runs.show, run_id=run, include=include)
-                except Exception as e:
-                    module.fail_json(msg='Unable to retrieve details on a run in "%s" workspace. Error: %s.' % (workspace, to_native(e)) )
-      
-                result_json['data'].append(ret['data'])
-                if include is not None:
-                    result_json['included'].extend(ret['included'])   
-
-    # Restrict results when as specified by filter. Otherwise, output the complte result set
+            result_json['data'].append(ret['data'])
+            if include is not None:
+                result_json['included'].extend(ret['included'])
+
+    # Restrict results (of both cases above) when as specified by filter. Otherwise, output the complte result set
     if filter is not None:
         result['json'] = restrict_results(filter=filter, result_input=result_json)
     else:
         result['json'] = result_json
 
     # Remove duplicates from list of runs and list of nested resources
-    if PY2:
-        result['json']['data'] = {v['id']:v for v in result['json']['data']}.values()
-        result['json']['included'] = {v['id']:v for v in result['json']['included']}.values()
-    else:
-        result['json']['data'] = list({v['id']:v for v in result['json']['data']}.values())
-        result['json']['included'] = list({v['id']:v for v in result['json']['included']}.values())
+    result['json']['data'] = remove_duplicates(result['json']['data'])
+    result['json']['included'] = remove_duplicates(result['json']['included'])
 
     module.exit_json(**result)
 
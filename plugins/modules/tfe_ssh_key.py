@@ -68,6 +68,23 @@ options:
     default: present
     choices: [ absent, present ]
     required: true
+  cache_dir:
+    description:
+    - Directory where the list of SSH keys is cached, e.g. C(~/.ansible/tmp).
+    - When set, modules run against the same organization within C(cache_ttl) seconds reuse the cached list instead of listing SSH keys again.
+    - The fingerprints of the SSH key values set by the module are kept there as well, so that an unchanged C(value)
+      is not sent again. TFE never returns the value, hence without them, every run with a C(value) updates the SSH key.
+      Note that a value changed outside of the module is not detected then.
+    - By default, nothing is cached on disk.
+    type: path
+    required: false
+  cache_ttl:
+    description:
+    - Number of seconds the list of SSH keys cached in C(cache_dir) is used for.
+    - C(0) disables the cache.
+    type: int
+    default: 30
+    required: false
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated.
@@ -81,14 +98,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -155,12 +185,34 @@ json:
                 type: ssh-keys          
 '''
 
+import hashlib
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
 
 from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
 
 
+def value_fingerprint(ssh_key_id=None, value=None):
+    """
+    Returns the fingerprint of the value (i.e. the private key) of the given SSH key.
+
+    """
+    return hashlib.sha256(('%s|%s' % (ssh_key_id, value)).encode('utf-8')).hexdigest()
+
+
+def save_fingerprints(tfe, fingerprints_file=None, fingerprints=None):
+    """
+    Stores the fingerprints of SSH key values. Failing to do so only means the values will be sent again next time,
+    which is reported as a warning.
+    """
+    if fingerprints_file is not None:
+        try:
+            tfe.write_cache(fingerprints_file, fingerprints)
+        except (IOError, OSError) as e:
+            tfe.module.warn('Unable to store SSH key fingerprints in "%s", the key values will be sent again next time: %s' % (fingerprints_file, to_native(e)))
+
+
 def main():
     argument_spec = TFEHelper.tfe_argument_spec()
     argument_spec.update(
@@ -170,7 +222,9 @@ def main():
         attributes=dict(
             type='dict', 
             required=False, no_log=False,
-        )
+        ),
+        cache_dir=dict(type='path', required=False),
+        cache_ttl=dict(type='int', required=False, default=30),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -197,24 +251,31 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
 
     # Get the list of all SSH keys
     try:        
-        all_ssh_keys = tfe.call_endpoint(tfe.api.ssh_keys.list)
+        all_ssh_keys = tfe.list_ssh_keys()
     except Exception as e:
         module.fail_json(msg='Unable to list SSH keys in "%s" organization. Error: %s.' % (organization, to_native(e)) )
 
+    # Index SSH keys by name and by ID. The first SSH key with a given name wins.
+    ssh_keys_by_name = {}
+    ssh_keys_by_id = {}
+    for k in all_ssh_keys['data']:
+        ssh_keys_by_name.setdefault(k['attributes']['name'], k)
+        ssh_keys_by_id[k['id']] = k
+
     # Get an existing SSH key ID. 
     ssh_key_id = None
     if ssh_key is not None:
         # Refer to an SSH key by its name
-        if any(k['attributes']['name'] == ssh_key for k in all_ssh_keys['data']):
-            ssh_key_id = [k for k in all_ssh_keys['data'] if k['attributes']['name'] == ssh_key][0]['id']
+        if ssh_key in ssh_keys_by_name:
+            ssh_key_id = ssh_keys_by_name[ssh_key]['id']
         # Refer to an SSH key by its ID
-        elif any(k['id'] == ssh_key for k in all_ssh_keys['data']):
+        elif ssh_key in ssh_keys_by_id:
             ssh_key_id = ssh_key
         else:
             if state == 'present':
@@ -223,8 +284,12 @@ def main():
         if 'name' not in attributes:
             module.fail_json(msg='`name` is required when creating a new SSH key')
         # Find ssh_key_id when 'New' SSH key already exists
-        if any(k['attributes']['name'] == attributes['name'] for k in all_ssh_keys['data']):
-            ssh_key_id = [k for k in all_ssh_keys['data'] if k['attributes']['name'] == attributes['name']][0]['id']
+        if attributes['name'] in ssh_keys_by_name:
+            ssh_key_id = ssh_keys_by_name[attributes['name']]['id']
+
+    # Fingerprints of the SSH key values set by the module, kept in 'cache_dir'
+    fingerprints_file = tfe.get_cache_file('ssh_key_values_%s' % organization)
+    fingerprints = tfe.read_cache(fingerprints_file) if fingerprints_file is not None else {}
 
     # Delete the SSH key if it exists and state == 'absent'
     if (state == 'absent') and (ssh_key_id is not None):
@@ -232,9 +297,13 @@ def main():
         if not module.check_mode:
             try:        
                 result['json'] = tfe.call_endpoint(tfe.api.ssh_keys.destroy, ssh_key_id=ssh_key_id)
+                tfe.invalidate_ssh_keys_cache()
             except Exception as e:
                 module.fail_json(msg='Unable to delete "%s" SSH key in "%s" organization. Error: %s.' % (ssh_key, organization, to_native(e)) )          
 
+            if fingerprints.pop(ssh_key_id, None) is not None:
+                save_fingerprints(tfe, fingerprints_file, fingerprints)
+
         result['changed'] = True
  
     # Update the SSH key if it exists and state == 'present'
@@ -248,16 +317,25 @@ def main():
               }
             }
 
-            # Check if 'attributes' is a subset of current attributes, i.e. if there is any change
-            current_attributes = [k for k in all_ssh_keys['data'] if k['id'] == ssh_key_id][0]['attributes']
-            if not tfe.is_subset(subset=attributes, superset=current_attributes):
+            # Check if 'attributes' is a subset of current attributes, i.e. if there is any change.
+            # TFE never returns the value of an SSH key, so it is compared to the fingerprint of the value last set instead, if any.
+            current_attributes = ssh_keys_by_id[ssh_key_id]['attributes']
+            compared_attributes = attributes
+            if ('value' in attributes) and (fingerprints.get(ssh_key_id) == value_fingerprint(ssh_key_id, attributes['value'])):
+                compared_attributes = dict((k, v) for k, v in attributes.items() if k != 'value')
+            if not tfe.is_subset(subset=compared_attributes, superset=current_attributes):
 
                 if not module.check_mode:
                     try:        
                         result['json'] = tfe.call_endpoint(tfe.api.ssh_keys.update, ssh_key_id=ssh_key_id, payload=k_payload)
+                        tfe.invalidate_ssh_keys_cache()
                     except Exception as e:
                         module.fail_json(msg='Unable to update "%s" SSH key in "%s" organization. Error: %s.' % (ssh_key, organization, to_native(e)) )    
 
+                    if 'value' in attributes:
+                        fingerprints[ssh_key_id] = value_fingerprint(ssh_key_id, attributes['value'])
+                        save_fingerprints(tfe, fingerprints_file, fingerprints)
+
                 result['changed'] = True
 
     # Create the SSH key if it does not exist and state == 'present'
@@ -276,9 +354,15 @@ def main():
         if not module.check_mode:
             try:        
                 result['json'] = tfe.call_endpoint(tfe.api.ssh_keys.create, payload=k_payload)
+                tfe.invalidate_ssh_keys_cache()
             except Exception as e:
                 module.fail_json(msg='Unable to create "%s" SSH key in "%s" organization. Error: %s.' % (ssh_key, organization, to_native(e)) )    
 
+            if 'value' in attributes:
+                new_ssh_key_id = result['json']['data']['id']
+                fingerprints[new_ssh_key_id] = value_fingerprint(new_ssh_key_id, attributes['value'])
+                save_fingerprints(tfe, fingerprints_file, fingerprints)
+
         result['changed'] = True
 
     module.exit_json(**result)
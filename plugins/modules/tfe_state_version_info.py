@@ -68,14 +68,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -177,7 +190,7 @@ json:
                   type: state-versions             
 '''
 
-import collections
+from collections.abc import Iterable
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
@@ -208,8 +221,8 @@ def main():
     # It's possible someone passed a comma separated string, so we should handle that.
     # This can be either an empty list or '*' which means all State Versions.
     state_versions = module.params['state_version']
-    if isinstance(module.params['state_version'], collections.Iterable):
-        state_versions = [p.strip() for p in module.params['state_version']]
+    if isinstance(state_versions, Iterable):
+        state_versions = [p.strip() for p in state_versions]
         state_versions = tfe.listify_comma_sep_strings_in_list(state_versions)
     if not state_versions:
         state_versions = [ '*' ]
@@ -225,7 +238,7 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
 
@@ -74,14 +74,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -162,7 +175,7 @@ json:
                   type: team-workspaces               
 '''
 
-import collections
+from collections.abc import Iterable
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
@@ -191,20 +204,20 @@ def main():
 
     # Parse `team` parameter and create list of teams.
     teams = module.params['team']
-    if isinstance(module.params['team'], collections.Iterable):
-        teams = [p.strip() for p in module.params['team']]
+    if isinstance(teams, Iterable):
+        teams = [p.strip() for p in teams]
         teams = tfe.listify_comma_sep_strings_in_list(teams)
 
     # Parse `workspace` parameter and create list of workspaces.
     workspaces = module.params['workspace']
-    if isinstance(module.params['workspace'], collections.Iterable):
-        workspaces = [p.strip() for p in module.params['workspace']]
+    if isinstance(workspaces, Iterable):
+        workspaces = [p.strip() for p in workspaces]
         workspaces = tfe.listify_comma_sep_strings_in_list(workspaces)
 
     # Parse `relationship` parameter and create list of relationships.
     relationships = module.params['relationship']
-    if isinstance(module.params['relationship'], collections.Iterable):
-        relationships = [p.strip() for p in module.params['relationship']]
+    if isinstance(relationships, Iterable):
+        relationships = [p.strip() for p in relationships]
         relationships = tfe.listify_comma_sep_strings_in_list(relationships)
 
     # Seed the result dict in the object
@@ -224,7 +237,7 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
     
@@ -64,14 +64,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -149,7 +162,7 @@ json:
                   type: teams                
 '''
 
-import collections
+from collections.abc import Iterable
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
@@ -178,8 +191,8 @@ def main():
     # It's possible someone passed a comma separated string, so we should handle that.
     # This can be either an empty list or '*' which means all teams.
     teams = module.params['team']
-    if isinstance(module.params['team'], collections.Iterable):
-        teams = [p.strip() for p in module.params['team']]
+    if isinstance(teams, Iterable):
+        teams = [p.strip() for p in teams]
         teams = tfe.listify_comma_sep_strings_in_list(teams)
     if not teams:
         teams = [ '*' ]
@@ -194,7 +207,7 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
     
@@ -58,14 +58,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -129,7 +142,7 @@ json:
                   type: authentication-tokens              
 '''
 
-import collections
+from collections.abc import Iterable
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
@@ -156,8 +169,8 @@ def main():
     # It's possible someone passed a comma separated string, so we should handle that.
     # This can be either an empty list or '*' which means all user tokens.
     tokens = module.params['user_token']
-    if isinstance(module.params['user_token'], collections.Iterable):
-        tokens = [p.strip() for p in module.params['user_token']]
+    if isinstance(tokens, Iterable):
+        tokens = [p.strip() for p in tokens]
         tokens = tfe.listify_comma_sep_strings_in_list(tokens)
     if not tokens:
         tokens = [ '*' ]
@@ -170,12 +183,14 @@ def main():
         json={},
     )
 
-    # Set organization
-    orgs = tfe.call_endpoint(tfe.api.orgs.list)
-    try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=orgs['data'][0]['id'])
+    # Set organization, any one will do, so only the first page of a single organization is retrieved
+    org = next(tfe.iter_orgs(page_size=1), None)
+    if org is None:
+        module.fail_json(msg='Unable to find any organization to use for org specific endpoints.')
+    try:
+        tfe.set_org(org_name=org['id'])
     except Exception as e:
-        module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
+        module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (org['id'], to_native(e)))
 
     # Retrieve information about all users
     try:        
@@ -203,6 +203,12 @@ options:
     - Empty string C("") unassigns the currently assigned SSH key from the workspace.
     type: str
     required: false  
+  cache_dir:
+    description:
+    - Directory where other modules of the collection cache the list of workspaces, see e.g. M(esp.terraform.tfe_remote_state_consumers).
+    - When set, the cached list of the organization is dropped after a workspace is created, updated or destroyed.
+    type: path
+    required: false
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated.
@@ -216,14 +222,27 @@ options:
     default: yes 
   sleep:
     description:
-      - Number of seconds to sleep between API retries.
+      - Number of seconds to sleep before the first API retry.
+      - The delay doubles on every subsequent retry.
     type: int
     default: 5
   retries:
     description:
       - Number of retries to call Terraform API URL before failure.
+      - Only transient errors (e.g. rate limiting, server errors, connection errors) are retried.
     type: int
     default: 3
+  max_delay:
+    description:
+      - Maximum number of seconds to sleep between API retries.
+    type: int
+    default: 30
+  jitter:
+    description:
+      - Random factor applied to the delay between API retries, so that concurrent clients do not retry in lockstep.
+      - The delay is multiplied by a random value between C(1) and C(1 + jitter).
+    type: float
+    default: 0.5
 notes:
 - Authentication must be done with U(token).
 - Supports C(check_mode).
@@ -421,7 +440,8 @@ def main():
         attributes=dict(
             type='dict', 
             required=False, no_log=False,
-        )
+        ),
+        cache_dir=dict(type='path', required=False),
     )
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -452,7 +472,7 @@ def main():
 
     # Set organization
     try:        
-        tfe.call_endpoint(tfe.api.set_org, org_name=organization)
+        tfe.set_org(org_name=organization)
     except Exception as e:
         module.fail_json(msg='Unable to set "%s" organization to use for org specific endpoints: %s' % (organization, to_native(e)))
 
@@ -487,6 +507,7 @@ def main():
         if not module.check_mode:
             try:        
                 result['json'] = tfe.call_endpoint(tfe.api.workspaces.destroy, workspace_id=workspace_id)
+                tfe.invalidate_workspaces_cache()
             except Exception as e:
                 module.fail_json(msg='Unable to destroy "%s" workspace in "%s" organization. Error: %s.' % (workspace, organization, to_native(e)) )          
 
@@ -510,6 +531,7 @@ def main():
                 if not module.check_mode:
                     try:        
                         result['json'] = tfe.call_endpoint(tfe.api.workspaces.update, workspace_id=workspace_id, payload=w_payload)
+                        tfe.invalidate_workspaces_cache()
                     except Exception as e:
                         module.fail_json(msg='Unable to update "%s" workspace in "%s" organization. Error: %s.' % (workspace, organization, to_native(e)) )    
 
@@ -620,6 +642,7 @@ def main():
         if not module.check_mode:
             try:        
                 result['json'] = tfe.call_endpoint(tfe.api.workspaces.create, payload=w_payload)
+                tfe.invalidate_workspaces_cache()
             except Exception as e:
                 module.fail_json(msg='Unable to create "%s" workspace in "%s" organization. Error: %s.' % (workspace, organization, to_native(e)) )    
 
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from collections import OrderedDict
+
+import pytest
+
+from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
+
+
+def baseline_is_subset(subset=None, superset=None):
+    # TFEHelper.is_subset() as it was before it was sped up
+    if isinstance(subset, dict):
+        return all(key in superset and baseline_is_subset(val, superset[key]) for key, val in subset.items())
+
+    if isinstance(subset, list) or isinstance(subset, set):
+        return all(any(baseline_is_subset(subitem, superitem) for superitem in superset) for subitem in subset)
+
+    return subset == superset
+
+
+@pytest.mark.parametrize('subset, superset', [
+    ({}, None),
+    ({}, 'abc'),
+    ({}, []),
+    ({'a': {}}, {'a': None}),
+    ({'a': {}}, {'a': 1}),
+    ({'a': []}, {'a': None}),
+    ([], None),
+    ([{}], [None]),
+    ({'a': 1}, {'a': 1, 'b': 2}),
+    ({'a': 1}, {'a': 2}),
+    ({'a': 1}, {'b': 1}),
+    ({'a': [1, 2]}, {'a': [2, 1, 3]}),
+    ({'a': [1, 4]}, {'a': [2, 1, 3]}),
+    ({'a': {'b': [{'c': 1}]}}, {'a': {'b': [{'c': 1, 'd': 2}], 'e': 3}}),
+    ({'a': {'b': [{'c': 1}]}}, {'a': {'b': [{'c': 2}]}}),
+    ({1, 2}, [2, 1]),
+    (OrderedDict(a=1), {'a': 1, 'b': 2}),
+    (OrderedDict(a=[1]), {'a': [2]}),
+    ('x', 'x'),
+    (None, None),
+])
+def test_is_subset_matches_baseline(subset, superset):
+    assert TFEHelper.is_subset(None, subset=subset, superset=superset) == baseline_is_subset(subset, superset)
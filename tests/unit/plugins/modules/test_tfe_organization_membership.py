@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import json
+import threading
+
+from ansible_collections.esp.terraform.plugins.module_utils.tfe_helper import TFEHelper
+from ansible_collections.esp.terraform.plugins.modules import tfe_organization_membership
+
+
+class FakeModule:
+    def __init__(self, **params):
+        self.params = dict(url='https://tfe.example.com', token='token', validate_certs=True, use_proxy=True,
+                           sleep=0, retries=1, max_delay=0, jitter=0, cache_dir=None)
+        self.params.update(params)
+        self.warnings = []
+
+    def warn(self, msg):
+        self.warnings.append(msg)
+
+
+class FakeApi:
+    _headers = {}
+
+    def get_org(self):
+        return 'foo'
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, body):
+        self.content = json.dumps(body).encode('utf-8')
+
+
+class FakeSession:
+    """
+    Answers every GET with the members whose email is exactly the encoded 'filter[email]' value, like TFE does.
+    """
+    def __init__(self, emails):
+        self.emails = emails
+        self.urls = []
+
+    def get(self, url, headers=None, verify=None):
+        self.urls.append(url)
+        data = [
+            dict(id='ou-%d' % i, attributes=dict(email=email), relationships=dict(user=dict(data=dict(id='user-%d' % i))))
+            for i, email in enumerate(self.emails)
+            if 'filter%5Bemail%5D=' + email.replace('+', '%2B').replace('@', '%40') in url
+        ]
+        return FakeResponse(dict(data=data, meta=dict(pagination={'total-pages': 1})))
+
+
+def make_helper(session, **params):
+    tfe = TFEHelper.__new__(TFEHelper)
+    tfe.module = FakeModule(**params)
+    tfe.session = session
+    tfe.api = FakeApi()
+    tfe.api.org_memberships = type('FakeEndpoint', (), dict(_org_base_url='https://tfe.example.com/api/v2/organizations/foo/organization-memberships'))()
+    tfe._memberships_cache = {}
+    tfe._http_caches = {}
+    tfe._http_caches_used = {}
+    tfe._http_caches_lock = threading.Lock()
+    return tfe
+
+
+def test_list_user_memberships_encodes_email_with_plus(tmp_path):
+    for cache_dir in (None, str(tmp_path)):
+        session = FakeSession(['a+b@x.com', 'a b@x.com'])
+        tfe = make_helper(session, cache_dir=cache_dir, cache_ttl=60)
+
+        memberships = tfe_organization_membership.list_user_memberships(tfe, user='a+b@x.com')
+
+        assert [m['attributes']['email'] for m in memberships['data']] == ['a+b@x.com']
+        assert all('a%2Bb%40x.com' in url for url in session.urls)
+        # A single user lookup leaves no file behind in 'cache_dir'
+        assert list(tmp_path.iterdir()) == []